@@ -3,9 +3,27 @@ Admin configuration for accounts app
 """
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import Profile, Client, Trainer
+from .models import Profile, Client, Trainer, ROLE_DISPLAY
+
+
+class OnlyChangeList(ChangeList):
+    """
+    ChangeList, загружающий только колонки из list_only_fields админки
+    (формы редактирования получают полные объекты)
+    """
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).only(*self.model_admin.list_only_fields)
+
+
+class OnlyChangeListMixin:
+    list_only_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        return OnlyChangeList
 
 
 class ProfileInline(admin.StackedInline):
@@ -19,9 +37,12 @@ class UserAdmin(BaseUserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff', 'get_role')
     list_filter = ('is_staff', 'is_superuser', 'is_active', 'profile__role')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('profile')
+
     def get_role(self, obj):
         if hasattr(obj, 'profile'):
-            return obj.profile.get_role_display()
+            return ROLE_DISPLAY.get(obj.profile.role, '-')
         return '-'
     get_role.short_description = 'Роль'
 
@@ -37,18 +58,31 @@ class ProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'role', 'phone', 'date_of_birth', 'created_at')
     list_filter = ('role', 'created_at')
     search_fields = ('user__username', 'user__email', 'phone')
+    list_select_related = ('user',)
     readonly_fields = ('created_at', 'updated_at')
 
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(OnlyChangeListMixin, admin.ModelAdmin):
     list_display = ('get_full_name', 'get_phone', 'is_student', 'get_email')
     list_filter = ('is_student',)
     search_fields = ('profile__user__username', 'profile__user__email', 'profile__phone')
-    filter_horizontal = ('group_members',)
+    list_select_related = ('profile__user',)
+    list_only_fields = ('id', 'is_student', 'profile__phone', 'profile__full_name', 'profile__user__email')
+    autocomplete_fields = ('group_members',)
+
+    def get_search_results(self, request, queryset, search_term):
+        queryset = queryset.select_related('profile__user')
+        return super().get_search_results(request, queryset, search_term)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        # Подписи выбранных участников группы берутся из профиля
+        if db_field.name == 'group_members':
+            kwargs['queryset'] = Client.objects.select_related('profile')
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
 
     def get_full_name(self, obj):
-        return obj.profile.user.get_full_name() or obj.profile.user.username
+        return obj.profile.full_name
     get_full_name.short_description = 'ФИО'
 
     def get_phone(self, obj):
@@ -61,12 +95,14 @@ class ClientAdmin(admin.ModelAdmin):
 
 
 @admin.register(Trainer)
-class TrainerAdmin(admin.ModelAdmin):
+class TrainerAdmin(OnlyChangeListMixin, admin.ModelAdmin):
     list_display = ('get_full_name', 'specialization', 'experience_years', 'is_active')
     list_filter = ('is_active', 'specialization')
     search_fields = ('profile__user__username', 'profile__user__email', 'specialization')
+    list_select_related = ('profile',)
+    list_only_fields = ('id', 'specialization', 'experience_years', 'is_active', 'profile__full_name')
     readonly_fields = ('profile',)
 
     def get_full_name(self, obj):
-        return obj.profile.user.get_full_name() or obj.profile.user.username
+        return obj.profile.full_name
     get_full_name.short_description = 'ФИО'
@@ -7,5 +7,8 @@ class AccountsConfig(AppConfig):
     verbose_name = 'Аккаунты и пользователи'
 
     def ready(self):
-        """Импортируем signals при запуске приложения"""
+        """Импортируем signals и прогреваем markdown при запуске приложения"""
         import apps.accounts.signals
+        from apps.accounts.templatetags.markdown_extras import warm_up_markdown
+
+        warm_up_markdown()
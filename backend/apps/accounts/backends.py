@@ -0,0 +1,114 @@
+"""
+Authentication backend с кешированием пользователя
+
+django.contrib.auth.get_user вызывает backend.get_user(user_id) на каждом
+запросе с сессией. CachedModelBackend отдаёт пользователя вместе с профилем
+из Redis, поэтому request.user и request.user.profile не обращаются к БД.
+В кеше хранятся только значения колонок (dict), а не pickled-модели.
+Хеш пароля в кеш не попадает: для проверки сессии кешируется
+HMAC get_session_auth_hash(), а password остаётся отложенным полем.
+"""
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from core.patterns.singleton import cache_manager
+from .models import Profile
+
+USER_CACHE_KEY = 'user:{}'
+USER_CACHE_TIMEOUT = 300
+
+# Префикс колонок профиля в выборке пользователя (LEFT JOIN через reverse one-to-one)
+PROFILE_PREFIX = 'profile__'
+
+# Колонки User, которые не кешируются
+USER_UNCACHED_FIELDS = frozenset({'password'})
+SESSION_AUTH_HASH_KEY = 'session_auth_hash'
+
+
+def user_cache_key(user_id):
+    """Ключ кеша пользователя"""
+    return USER_CACHE_KEY.format(user_id)
+
+
+def invalidate_user_cache(user_id):
+    """
+    Сбрасывает кеш пользователя после фиксации транзакции
+
+    Вызывается явно там, где User/Profile меняются через queryset.update()
+    (сигналы post_save при этом не отправляются)
+    """
+    if user_id is not None:
+        transaction.on_commit(lambda: cache_manager.delete(user_cache_key(user_id)))
+
+
+def _column_names(model, exclude=frozenset()):
+    return [field.attname for field in model._meta.concrete_fields if field.attname not in exclude]
+
+
+def _load_user_values(user_id):
+    """
+    Колонки User и Profile одним запросом.
+    Вместо хеша пароля в значениях остаётся только хеш сессии
+    """
+    values = (
+        User._default_manager
+        .filter(pk=user_id)
+        .values(
+            *_column_names(User),
+            *(PROFILE_PREFIX + name for name in _column_names(Profile))
+        )
+        .first()
+    )
+    if values is None:
+        return None
+
+    user_names = _column_names(User)
+    user = User.from_db('default', user_names, [values[name] for name in user_names])
+    values[SESSION_AUTH_HASH_KEY] = user.get_session_auth_hash()
+    for name in USER_UNCACHED_FIELDS:
+        del values[name]
+    return values
+
+
+def _user_from_values(values, db='default'):
+    """
+    Восстанавливает User (и профиль, если он есть) из закешированных колонок.
+    password отложен: get_session_auth_hash() отдаёт закешированный хеш,
+    а обращение к user.password загружает его из БД
+    """
+    user_names = _column_names(User, exclude=USER_UNCACHED_FIELDS)
+    user = User.from_db(db, user_names, [values[name] for name in user_names])
+    session_auth_hash = values[SESSION_AUTH_HASH_KEY]
+    user.get_session_auth_hash = lambda: session_auth_hash
+
+    if values[PROFILE_PREFIX + Profile._meta.pk.attname] is not None:
+        profile_names = _column_names(Profile)
+        user.profile = Profile.from_db(
+            db, profile_names, [values[PROFILE_PREFIX + name] for name in profile_names]
+        )
+
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, загружающий пользователя из кеша
+
+    Аутентификация и проверка сессии остаются стандартными
+    (django.contrib.auth.get_user), переопределена только загрузка по id.
+    Кеш сбрасывается сигналами accounts и явно при queryset.update()
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        values = cache_manager.get(key)
+        if values is None:
+            values = _load_user_values(user_id)
+            if values is None:
+                return None
+            cache_manager.set(key, values, USER_CACHE_TIMEOUT)
+
+        user = _user_from_values(values)
+        return user if self.user_can_authenticate(user) else None
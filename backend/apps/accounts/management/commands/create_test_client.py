@@ -4,6 +4,7 @@ Management command для создания тестового клиента с
 
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db import transaction
 from apps.accounts.models import Profile, Client, UserRole
 from apps.memberships.models import MembershipType, Membership, MembershipStatus
 from datetime import date, timedelta
@@ -44,23 +45,25 @@ class Command(BaseCommand):
         password = options['password']
         phone = options['phone']
 
-        # Проверяем, существует ли пользователь
-        if User.objects.filter(username=username).exists():
+        # Создаём или получаем пользователя
+        user, created = User.objects.get_or_create(
+            username=username,
+            defaults={
+                'email': email,
+                'first_name': 'Тест',
+                'last_name': 'Клиентов'
+            }
+        )
+
+        if created:
+            user.set_password(password)
+            user.save(update_fields=['password'])
             self.stdout.write(
-                self.style.WARNING(f'⚠️  Пользователь {username} уже существует!')
+                self.style.SUCCESS(f'✅ Создан пользователь: {username}')
             )
-            user = User.objects.get(username=username)
         else:
-            # Создаём пользователя
-            user = User.objects.create_user(
-                username=username,
-                email=email,
-                password=password,
-                first_name='Тест',
-                last_name='Клиентов'
-            )
             self.stdout.write(
-                self.style.SUCCESS(f'✅ Создан пользователь: {username}')
+                self.style.WARNING(f'⚠️  Пользователь {username} уже существует!')
             )
 
         # Создаём или получаем профиль
@@ -81,61 +84,65 @@ class Command(BaseCommand):
                 self.style.WARNING(f'ℹ️  Профиль уже существует')
             )
 
-        # Проверяем, что создался Client (благодаря signal)
-        try:
-            client = profile.client_info
+        # Client обычно уже создан сигналом, get_or_create идемпотентен
+        client, created = Client.objects.get_or_create(profile=profile)
+
+        if created:
             self.stdout.write(
-                self.style.SUCCESS(f'✅ Client запись существует')
+                self.style.WARNING(f'⚠️  Client создан вручную (signal не сработал)')
             )
-        except Client.DoesNotExist:
-            # Если по какой-то причине не создался, создаём вручную
-            client = Client.objects.create(profile=profile)
+        else:
             self.stdout.write(
-                self.style.WARNING(f'⚠️  Client создан вручную (signal не сработал)')
+                self.style.SUCCESS(f'✅ Client запись существует')
             )
 
-        # Получаем первый активный тип абонемента
-        membership_type = MembershipType.objects.filter(is_active=True).first()
+        with transaction.atomic():
+            # Проверяем, есть ли уже активный абонемент
+            existing_membership = Membership.objects.select_related(
+                'membership_type'
+            ).filter(
+                client=client,
+                status=MembershipStatus.ACTIVE
+            ).first()
 
-        if not membership_type:
-            self.stdout.write(
-                self.style.ERROR('❌ Нет активных типов абонементов! Запустите create_test_data.')
-            )
-            return
+            if existing_membership:
+                self.stdout.write(
+                    self.style.WARNING(f'ℹ️  У клиента уже есть активный абонемент: {existing_membership.membership_type.name}')
+                )
+                self.stdout.write(
+                    self.style.WARNING(f'    Посещений осталось: {existing_membership.visits_remaining if existing_membership.visits_remaining else "Безлимит"}')
+                )
+            else:
+                # Получаем первый активный тип абонемента (только нужные поля)
+                membership_type = MembershipType.objects.only(
+                    'id', 'name', 'visits_limit'
+                ).filter(is_active=True).first()
 
-        # Проверяем, есть ли уже активный абонемент
-        existing_membership = Membership.objects.filter(
-            client=client,
-            status=MembershipStatus.ACTIVE
-        ).first()
+                if not membership_type:
+                    self.stdout.write(
+                        self.style.ERROR('❌ Нет активных типов абонементов! Запустите create_test_data.')
+                    )
+                    return
 
-        if existing_membership:
-            self.stdout.write(
-                self.style.WARNING(f'ℹ️  У клиента уже есть активный абонемент: {existing_membership.membership_type.name}')
-            )
-            self.stdout.write(
-                self.style.WARNING(f'    Посещений осталось: {existing_membership.visits_remaining if existing_membership.visits_remaining else "Безлимит"}')
-            )
-        else:
-            # Создаём активный абонемент на 30 дней
-            membership = Membership.objects.create(
-                client=client,
-                membership_type=membership_type,
-                status=MembershipStatus.ACTIVE,
-                start_date=date.today(),
-                end_date=date.today() + timedelta(days=30),
-                visits_remaining=membership_type.visits_limit
-            )
+                # Создаём активный абонемент на 30 дней
+                membership = Membership.objects.create(
+                    client=client,
+                    membership_type=membership_type,
+                    status=MembershipStatus.ACTIVE,
+                    start_date=date.today(),
+                    end_date=date.today() + timedelta(days=30),
+                    visits_remaining=membership_type.visits_limit
+                )
 
-            self.stdout.write(
-                self.style.SUCCESS(f'✅ Создан абонемент: {membership_type.name}')
-            )
-            self.stdout.write(
-                self.style.SUCCESS(f'   Действует: {membership.start_date} - {membership.end_date}')
-            )
-            self.stdout.write(
-                self.style.SUCCESS(f'   Посещений: {membership.visits_remaining if membership.visits_remaining else "Безлимит"}')
-            )
+                self.stdout.write(
+                    self.style.SUCCESS(f'✅ Создан абонемент: {membership_type.name}')
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(f'   Действует: {membership.start_date} - {membership.end_date}')
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(f'   Посещений: {membership.visits_remaining if membership.visits_remaining else "Безлимит"}')
+                )
 
         # Итоговая информация
         self.stdout.write('\n' + '='*50)
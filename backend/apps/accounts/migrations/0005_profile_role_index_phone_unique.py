@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:24
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def clear_duplicate_phones(apps, schema_editor):
+    """
+    Телефон остаётся у самого раннего профиля, у остальных дубликатов
+    очищается: иначе uniq_profile_phone не создать на существующих данных
+    """
+    Profile = apps.get_model("accounts", "Profile")
+    duplicates = (
+        Profile.objects.exclude(phone="")
+        .values("phone")
+        .annotate(first_id=Min("id"), count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        Profile.objects.filter(phone=row["phone"]).exclude(id=row["first_id"]).update(
+            phone=""
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0004_workoutplan_nutritionplan_aichat_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="role",
+            field=models.CharField(
+                choices=[
+                    ("CLIENT", "Клиент"),
+                    ("TRAINER", "Тренер"),
+                    ("ADMIN", "Администратор"),
+                ],
+                db_index=True,
+                default="CLIENT",
+                max_length=10,
+                verbose_name="Роль",
+            ),
+        ),
+        migrations.RunPython(clear_duplicate_phones, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="profile",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("phone__gt", "")),
+                fields=("phone",),
+                name="uniq_profile_phone",
+            ),
+        ),
+    ]
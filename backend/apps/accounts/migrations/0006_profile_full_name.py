@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:26
+
+from django.db import migrations, models
+
+
+def fill_full_name(apps, schema_editor):
+    Profile = apps.get_model("accounts", "Profile")
+    profiles = list(Profile.objects.select_related("user"))
+    for profile in profiles:
+        user = profile.user
+        profile.full_name = (
+            f"{user.first_name} {user.last_name}".strip() or user.username
+        )
+    Profile.objects.bulk_update(profiles, ["full_name"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_profile_role_index_phone_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="full_name",
+            field=models.CharField(
+                blank=True, db_index=True, max_length=301, verbose_name="ФИО"
+            ),
+        ),
+        migrations.RunPython(fill_full_name, migrations.RunPython.noop),
+    ]
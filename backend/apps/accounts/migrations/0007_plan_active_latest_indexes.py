@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_profile_full_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="nutritionplan",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["client", "-created_at"],
+                name="np_active_latest_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workoutplan",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["client", "-created_at"],
+                name="wp_active_latest_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:50
+
+from django.db import migrations, models
+import phonenumbers
+
+
+def normalize_phone(phone):
+    """Копия accounts.models.normalize_phone на момент миграции"""
+    try:
+        number = phonenumbers.parse(phone, "RU")
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_possible_number(number):
+        return None
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def fill_phone_e164(apps, schema_editor):
+    Profile = apps.get_model("accounts", "Profile")
+    profiles = list(
+        Profile.objects.exclude(phone="").order_by("id").only("id", "phone")
+    )
+    seen = set()
+    for profile in profiles:
+        phone_e164 = normalize_phone(profile.phone)
+        if phone_e164 is None:
+            continue
+        # Тот же номер в другом формате: телефон остаётся у более раннего
+        # профиля, иначе следующий Profile.save() нарушит уникальность phone_e164
+        if phone_e164 in seen:
+            profile.phone = ""
+            continue
+        seen.add(phone_e164)
+        profile.phone_e164 = phone_e164
+    Profile.objects.bulk_update(profiles, ["phone", "phone_e164"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_plan_active_latest_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="phone_e164",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=16,
+                null=True,
+                unique=True,
+                verbose_name="Телефон (E.164)",
+            ),
+        ),
+        migrations.RunPython(fill_phone_e164, migrations.RunPython.noop),
+    ]
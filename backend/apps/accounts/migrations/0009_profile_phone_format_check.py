@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:52
+
+import re
+
+from django.db import migrations, models
+
+PHONE_REGEX = r"^\+?1?\d{9,15}$"
+
+
+def fix_phone_format(apps, schema_editor):
+    """
+    Телефоны, не проходящие PHONE_REGEX (например, '+7 (999) 123-45-67'),
+    заменяются нормализованным номером из phone_e164 или очищаются,
+    если номер не распознан: иначе CHECK не создать на существующих данных
+    """
+    Profile = apps.get_model("accounts", "Profile")
+    profiles = list(
+        Profile.objects.exclude(phone="")
+        .exclude(phone__regex=PHONE_REGEX)
+        .only("id", "phone", "phone_e164")
+    )
+    for profile in profiles:
+        if profile.phone_e164 and re.match(PHONE_REGEX, profile.phone_e164):
+            profile.phone = profile.phone_e164
+        else:
+            profile.phone = ""
+            profile.phone_e164 = None
+    Profile.objects.bulk_update(profiles, ["phone", "phone_e164"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0008_profile_phone_e164"),
+    ]
+
+    operations = [
+        migrations.RunPython(fix_phone_format, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="profile",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    ("phone", ""),
+                    ("phone__regex", PHONE_REGEX),
+                    _connector="OR",
+                ),
+                name="profile_phone_format",
+            ),
+        ),
+    ]
@@ -4,8 +4,10 @@ Extends Django's built-in User model
 """
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.core.validators import RegexValidator
+import phonenumbers
 
 
 class UserRole(models.TextChoices):
@@ -15,6 +17,85 @@ class UserRole(models.TextChoices):
     ADMIN = 'ADMIN', 'Администратор'
 
 
+# Подписи ролей для отображения (без обхода choices на каждый вызов)
+ROLE_DISPLAY = dict(UserRole.choices)
+ROLE_VALUES = frozenset(ROLE_DISPLAY)
+
+# Формат телефона: проверяется валидатором формы и CHECK-ограничением в БД
+PHONE_REGEX = r'^\+?1?\d{9,15}$'
+
+# Регион для номеров без кода страны (8 999 ... / 999 ...)
+PHONE_DEFAULT_REGION = 'RU'
+
+
+def normalize_phone(phone):
+    """
+    Приводит телефон к формату E.164 (+79991234567).
+    Возвращает None для пустого, нераспознанного или невозможного номера:
+    PHONE_REGEX пропускает 15 цифр без кода страны, а с префиксом региона
+    такой номер длиннее E.164 и не помещается в phone_e164
+    """
+    if not phone:
+        return None
+    try:
+        number = phonenumbers.parse(phone, PHONE_DEFAULT_REGION)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_possible_number(number):
+        return None
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+class ProfileManager(models.Manager):
+    """Manager with bulk helpers for Profile"""
+
+    def bulk_create_with_roles(self, profiles):
+        """
+        Bulk insert profiles together with their Client/Trainer rows.
+        bulk_create bypasses post_save, so the role-specific rows the signal
+        would create are inserted here in one statement per model.
+        Profile.user must already be set (and saved) on every profile.
+        """
+        for profile in profiles:
+            if not profile.full_name:
+                profile.full_name = profile.user.get_full_name() or profile.user.username
+            profile.phone_e164 = normalize_phone(profile.phone)
+
+        with transaction.atomic():
+            profiles = self.bulk_create(profiles)
+            Client.objects.bulk_create([
+                Client(profile=profile)
+                for profile in profiles if profile.role == UserRole.CLIENT
+            ])
+            Trainer.objects.bulk_create([
+                Trainer(profile=profile, specialization='Не указано', experience_years=0)
+                for profile in profiles if profile.role == UserRole.TRAINER
+            ])
+
+        return profiles
+
+
+class ClientManager(models.Manager):
+    """Manager with bulk helpers for Client"""
+
+    def bulk_add_group_members(self, owner, members):
+        """
+        Add members to owner's group in a single INSERT.
+        group_members is symmetrical, so both directions are written
+        explicitly; existing pairs are skipped. m2m_changed is not sent.
+        """
+        through = self.model.group_members.through
+        rows = []
+        for member in members:
+            if member.pk == owner.pk:
+                continue
+            rows.append(through(from_client_id=owner.pk, to_client_id=member.pk))
+            rows.append(through(from_client_id=member.pk, to_client_id=owner.pk))
+
+        with transaction.atomic():
+            through.objects.bulk_create(rows, ignore_conflicts=True)
+
+
 class Profile(models.Model):
     """
     Extended user profile for all users (clients, trainers, admins)
@@ -24,12 +105,13 @@ class Profile(models.Model):
         max_length=10,
         choices=UserRole.choices,
         default=UserRole.CLIENT,
+        db_index=True,
         verbose_name='Роль'
     )
 
     # Contact information
     phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
+        regex=PHONE_REGEX,
         message="Номер телефона должен быть в формате: '+79991234567'"
     )
     phone = models.CharField(
@@ -38,8 +120,20 @@ class Profile(models.Model):
         blank=True,
         verbose_name='Телефон'
     )
+    # Нормализованный телефон: уникален независимо от формата записи (8..., +7..., 7...)
+    phone_e164 = models.CharField(
+        max_length=16,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Телефон (E.164)'
+    )
     date_of_birth = models.DateField(null=True, blank=True, verbose_name='Дата рождения')
 
+    # Denormalized display name (заполняется сигналами из User)
+    full_name = models.CharField(max_length=301, blank=True, db_index=True, verbose_name='ФИО')
+
     # Avatar choices
     AVATAR_CHOICES = [
         ('avatar1.png', 'Аватар 1 - Спортсмен'),
@@ -66,13 +160,54 @@ class Profile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата регистрации')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Дата обновления')
 
+    objects = ProfileManager()
+
     class Meta:
         verbose_name = 'Профиль'
         verbose_name_plural = 'Профили'
         ordering = ['-created_at']
+        constraints = [
+            # Пустой телефон допускается у нескольких профилей
+            models.UniqueConstraint(
+                fields=['phone'],
+                condition=Q(phone__gt=''),
+                name='uniq_profile_phone'
+            ),
+            # Формат проверяет БД, сериализаторы не гоняют регулярку на каждом запросе
+            models.CheckConstraint(
+                check=Q(phone='') | Q(phone__regex=PHONE_REGEX),
+                name='profile_phone_format'
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.user.get_full_name() or self.user.username} ({self.get_role_display()})"
+        return f"{self.full_name} ({ROLE_DISPLAY.get(self.role, self.role)})"
+
+    def save(self, *args, **kwargs):
+        self.phone_e164 = normalize_phone(self.phone)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'phone' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'phone_e164'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Роль на момент загрузки: сигнал пропускает сохранения без смены роли
+        instance._saved_role = instance.__dict__.get('role')
+        return instance
+
+    def has_client(self):
+        """Есть ли у профиля Client (без загрузки строки, если она ещё не в памяти)"""
+        if Profile.client_info.is_cached(self):
+            return hasattr(self, 'client_info')
+        return Client.objects.filter(profile=self).exists()
+
+    def has_trainer(self):
+        """Есть ли у профиля Trainer (без загрузки строки, если она ещё не в памяти)"""
+        if Profile.trainer_info.is_cached(self):
+            return hasattr(self, 'trainer_info')
+        return Trainer.objects.filter(profile=self).exists()
 
 
 class Client(models.Model):
@@ -93,12 +228,14 @@ class Client(models.Model):
     # Group members (for group discount)
     group_members = models.ManyToManyField('self', blank=True, symmetrical=True, verbose_name='Участники группы')
 
+    objects = ClientManager()
+
     class Meta:
         verbose_name = 'Клиент'
         verbose_name_plural = 'Клиенты'
 
     def __str__(self):
-        return self.profile.user.get_full_name() or self.profile.user.username
+        return self.profile.full_name
 
 
 class Trainer(models.Model):
@@ -122,7 +259,7 @@ class Trainer(models.Model):
         verbose_name_plural = 'Тренеры'
 
     def __str__(self):
-        return f"{self.profile.user.get_full_name()} - {self.specialization}"
+        return f"{self.profile.full_name} - {self.specialization}"
 
 
 # Import AI-related models
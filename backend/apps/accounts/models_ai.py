@@ -2,6 +2,7 @@
 Модели для AI Персонального тренера
 """
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 
@@ -22,6 +23,11 @@ class FitnessLevel(models.TextChoices):
     ADVANCED = 'ADVANCED', 'Продвинутый'
 
 
+# Подписи целей и уровней для промптов AI (без обхода choices на каждый запрос)
+FITNESS_GOAL_DISPLAY = dict(FitnessGoal.choices)
+FITNESS_LEVEL_DISPLAY = dict(FitnessLevel.choices)
+
+
 class WorkoutPlan(models.Model):
     """
     Программа тренировок, сгенерированная AI
@@ -69,10 +75,16 @@ class WorkoutPlan(models.Model):
         indexes = [
             models.Index(fields=['client', '-created_at']),
             models.Index(fields=['is_active']),
+            # Последний активный план клиента одним сканом индекса
+            models.Index(
+                fields=['client', '-created_at'],
+                condition=Q(is_active=True),
+                name='wp_active_latest_idx'
+            ),
         ]
 
     def __str__(self):
-        return f"План для {self.client.profile.user.get_full_name()} от {self.created_at.strftime('%d.%m.%Y')}"
+        return f"План для {self.client.profile.full_name} от {self.created_at.strftime('%d.%m.%Y')}"
 
 
 class NutritionPlan(models.Model):
@@ -116,10 +128,16 @@ class NutritionPlan(models.Model):
         indexes = [
             models.Index(fields=['client', '-created_at']),
             models.Index(fields=['is_active']),
+            # Последний активный план клиента одним сканом индекса
+            models.Index(
+                fields=['client', '-created_at'],
+                condition=Q(is_active=True),
+                name='np_active_latest_idx'
+            ),
         ]
 
     def __str__(self):
-        return f"План питания для {self.client.profile.user.get_full_name()} от {self.created_at.strftime('%d.%m.%Y')}"
+        return f"План питания для {self.client.profile.full_name} от {self.created_at.strftime('%d.%m.%Y')}"
 
 
 class AIChat(models.Model):
@@ -157,4 +175,4 @@ class AIChat(models.Model):
         ]
 
     def __str__(self):
-        return f"Вопрос от {self.client.profile.user.get_full_name()} в {self.created_at.strftime('%d.%m.%Y %H:%M')}"
+        return f"Вопрос от {self.client.profile.full_name} в {self.created_at.strftime('%d.%m.%Y %H:%M')}"
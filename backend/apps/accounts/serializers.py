@@ -4,25 +4,51 @@ Serializers for accounts app
 
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.crypto import constant_time_compare
 from .models import Profile, Client, Trainer, UserRole
 
 
+def _phone_error(phone):
+    """
+    Build the field error for a phone rejected by a DB constraint
+    (format CHECK or uniqueness). The regex runs only on this error path.
+    """
+    if not Profile.phone_regex.regex.match(phone):
+        return serializers.ValidationError({'phone': Profile.phone_regex.message})
+    return serializers.ValidationError({'phone': "Пользователь с таким телефоном уже существует"})
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration
     """
-    password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
+    password = serializers.CharField(write_only=True, required=True)
     password2 = serializers.CharField(write_only=True, required=True)
-    phone = serializers.CharField(required=True)
+    # Телефон хранится в Profile, а не в User: только на запись
+    phone = serializers.CharField(write_only=True, required=True)
 
     class Meta:
         model = User
-        fields = ('username', 'password', 'password2', 'email', 'first_name', 'last_name', 'phone')
+        fields = ('id', 'username', 'password', 'password2', 'email', 'first_name', 'last_name', 'phone')
 
     def validate(self, attrs):
-        if attrs['password'] != attrs['password2']:
+        # Cheap confirmation check first, strength validators only afterwards
+        if not constant_time_compare(attrs['password'], attrs['password2']):
             raise serializers.ValidationError({"password": "Пароли не совпадают"})
+
+        user = User(
+            username=attrs.get('username', ''),
+            email=attrs.get('email', ''),
+            first_name=attrs.get('first_name', ''),
+            last_name=attrs.get('last_name', '')
+        )
+        try:
+            validate_password(attrs['password'], user=user)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({"password": list(e.messages)})
         return attrs
 
     def create(self, validated_data):
@@ -30,24 +56,26 @@ class RegisterSerializer(serializers.ModelSerializer):
         validated_data.pop('password2')
         phone = validated_data.pop('phone')
 
-        # Create user
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data.get('email', ''),
-            first_name=validated_data.get('first_name', ''),
-            last_name=validated_data.get('last_name', ''),
-            password=validated_data['password']
-        )
-
-        # Create profile
-        profile = Profile.objects.create(
-            user=user,
-            phone=phone,
-            role=UserRole.CLIENT
-        )
+        with transaction.atomic():
+            # Create user
+            user = User.objects.create_user(
+                username=validated_data['username'],
+                email=validated_data.get('email', ''),
+                first_name=validated_data.get('first_name', ''),
+                last_name=validated_data.get('last_name', ''),
+                password=validated_data['password']
+            )
+
+            # Create profile (Client создаётся ниже, сигнал не нужен)
+            profile = Profile(user=user, phone=phone, role=UserRole.CLIENT)
+            profile._skip_signal = True
+            try:
+                profile.save()
+            except IntegrityError:
+                raise _phone_error(phone)
 
-        # Create client info
-        Client.objects.create(profile=profile)
+            # Create client info
+            Client.objects.create(profile=profile)
 
         return user
 
@@ -67,6 +95,31 @@ class ProfileSerializer(serializers.ModelSerializer):
                   'phone', 'date_of_birth', 'photo', 'address', 'created_at')
         read_only_fields = ('id', 'username', 'role', 'created_at')
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join user in the list query to avoid per-row lookups"""
+        return queryset.select_related('user')
+
+    def update(self, instance, validated_data):
+        """Update User and Profile (email/name live on User)"""
+        with transaction.atomic():
+            user_data = validated_data.pop('user', {})
+            if user_data:
+                user = instance.user
+                for attr, value in user_data.items():
+                    setattr(user, attr, value)
+                user.save(update_fields=list(user_data))
+
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            if validated_data:
+                try:
+                    instance.save(update_fields=[*validated_data, 'updated_at'])
+                except IntegrityError:
+                    raise _phone_error(instance.phone)
+
+        return instance
+
 
 class UserDetailSerializer(serializers.ModelSerializer):
     """Serializer for User details"""
@@ -77,10 +130,19 @@ class UserDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'username']
 
 
+# Profile/User columns read by ProfileSerializer when nested under Client/Trainer
+PROFILE_ONLY_FIELDS = (
+    'profile__id', 'profile__role', 'profile__phone', 'profile__date_of_birth',
+    'profile__photo', 'profile__address', 'profile__created_at', 'profile__full_name',
+    'profile__user__username', 'profile__user__email',
+    'profile__user__first_name', 'profile__user__last_name',
+)
+
+
 class ClientSerializer(serializers.ModelSerializer):
     """Serializer for Client model - for list/retrieve"""
     profile = ProfileSerializer(read_only=True)
-    full_name = serializers.SerializerMethodField()
+    full_name = serializers.CharField(source='profile.full_name', read_only=True)
     email = serializers.EmailField(source='profile.user.email', read_only=True)
 
     class Meta:
@@ -89,11 +151,16 @@ class ClientSerializer(serializers.ModelSerializer):
             'id', 'profile', 'full_name', 'email', 'is_student',
             'emergency_contact', 'emergency_phone', 'medical_notes'
         ]
-        read_only_fields = ['id']
-
-    def get_full_name(self, obj):
-        """Get client's full name"""
-        return obj.profile.user.get_full_name() or obj.profile.user.username
+        # Writes go through ClientCreateSerializer/ClientUpdateSerializer
+        read_only_fields = fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join profile and user in the list query to avoid per-row lookups"""
+        return queryset.select_related('profile__user').only(
+            'id', 'is_student', 'emergency_contact', 'emergency_phone', 'medical_notes',
+            *PROFILE_ONLY_FIELDS
+        )
 
 
 class ClientCreateSerializer(serializers.Serializer):
@@ -116,22 +183,8 @@ class ClientCreateSerializer(serializers.Serializer):
     emergency_phone = serializers.CharField(max_length=17, required=False, allow_blank=True)
     medical_notes = serializers.CharField(required=False, allow_blank=True)
 
-    def validate_username(self, value):
-        """Check if username already exists"""
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("Пользователь с таким username уже существует")
-        return value
-
-    def validate_phone(self, value):
-        """Check if phone already exists"""
-        if Profile.objects.filter(phone=value).exists():
-            raise serializers.ValidationError("Пользователь с таким телефоном уже существует")
-        return value
-
     def create(self, validated_data):
         """Create User, Profile and Client"""
-        from django.db import transaction
-
         # Extract data for different models
         user_data = {
             'username': validated_data['username'],
@@ -155,13 +208,25 @@ class ClientCreateSerializer(serializers.Serializer):
             'medical_notes': validated_data.get('medical_notes', ''),
         }
 
-        # Create all objects in transaction
+        # Create all objects in transaction.
+        # Uniqueness of username and phone, and the phone format,
+        # are enforced by DB constraints.
         with transaction.atomic():
             # Create User
-            user = User.objects.create_user(password=password, **user_data)
-
-            # Create Profile
-            profile = Profile.objects.create(user=user, **profile_data)
+            try:
+                user = User.objects.create_user(password=password, **user_data)
+            except IntegrityError:
+                raise serializers.ValidationError(
+                    {'username': "Пользователь с таким username уже существует"}
+                )
+
+            # Create Profile (Client создаётся ниже, сигнал не нужен)
+            profile = Profile(user=user, **profile_data)
+            profile._skip_signal = True
+            try:
+                profile.save()
+            except IntegrityError:
+                raise _phone_error(profile.phone)
 
             # Create Client
             client = Client.objects.create(profile=profile, **client_data)
@@ -195,16 +260,16 @@ class ClientUpdateSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         """Update User, Profile and Client"""
-        from django.db import transaction
-
         with transaction.atomic():
             # Update User fields
+            # Each save writes only the submitted columns
             if 'profile' in validated_data and 'user' in validated_data['profile']:
                 user_data = validated_data['profile'].pop('user')
                 user = instance.profile.user
                 for attr, value in user_data.items():
                     setattr(user, attr, value)
-                user.save()
+                if user_data:
+                    user.save(update_fields=list(user_data))
 
             # Update Profile fields
             if 'profile' in validated_data:
@@ -212,12 +277,17 @@ class ClientUpdateSerializer(serializers.ModelSerializer):
                 profile = instance.profile
                 for attr, value in profile_data.items():
                     setattr(profile, attr, value)
-                profile.save()
+                if profile_data:
+                    try:
+                        profile.save(update_fields=[*profile_data, 'updated_at'])
+                    except IntegrityError:
+                        raise _phone_error(profile.phone)
 
             # Update Client fields
             for attr, value in validated_data.items():
                 setattr(instance, attr, value)
-            instance.save()
+            if validated_data:
+                instance.save(update_fields=list(validated_data))
 
         return instance
 
@@ -225,7 +295,7 @@ class ClientUpdateSerializer(serializers.ModelSerializer):
 class TrainerSerializer(serializers.ModelSerializer):
     """Serializer for Trainer model"""
     profile = ProfileSerializer(read_only=True)
-    full_name = serializers.SerializerMethodField()
+    full_name = serializers.CharField(source='profile.full_name', read_only=True)
 
     class Meta:
         model = Trainer
@@ -233,8 +303,25 @@ class TrainerSerializer(serializers.ModelSerializer):
             'id', 'profile', 'full_name', 'specialization',
             'experience_years', 'bio', 'certifications', 'is_active'
         ]
-        read_only_fields = ['id']
+        # Updates go through TrainerUpdateSerializer
+        read_only_fields = fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join profile and user in the list query to avoid per-row lookups"""
+        return queryset.select_related('profile__user').only(
+            'id', 'specialization', 'experience_years', 'bio', 'certifications', 'is_active',
+            *PROFILE_ONLY_FIELDS
+        )
+
 
-    def get_full_name(self, obj):
-        """Get trainer's full name"""
-        return obj.profile.user.get_full_name() or obj.profile.user.username
+class TrainerUpdateSerializer(serializers.ModelSerializer):
+    """Serializer for updating trainer information"""
+
+    class Meta:
+        model = Trainer
+        fields = ['specialization', 'experience_years', 'bio', 'certifications', 'is_active']
+
+    def to_representation(self, instance):
+        """Use TrainerSerializer for output representation"""
+        return TrainerSerializer(instance).data
@@ -2,37 +2,98 @@
 Signals для автоматического создания связанных объектов
 """
 
-from django.db.models.signals import post_save
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
+from .backends import invalidate_user_cache
 from .models import Profile, Client, Trainer, UserRole
 
+# Значения ролей, сравниваемые при каждом сохранении Profile
+_ROLE_CLIENT = UserRole.CLIENT.value
+_ROLE_TRAINER = UserRole.TRAINER.value
+
 
 @receiver(post_save, sender=Profile)
-def create_role_specific_profile(sender, instance, created, **kwargs):
+def create_role_specific_profile(sender, instance, created, update_fields=None, **kwargs):
     """
     Автоматически создаёт Client или Trainer запись при создании Profile
-    в зависимости от роли
+    или при смене роли
+    """
+    # Связанная запись создаётся вызывающим кодом
+    if getattr(instance, '_skip_signal', False):
+        return
+
+    # Сохранение отдельных полей без роли не требует проверки
+    if update_fields is not None and 'role' not in update_fields:
+        return
+
+    # Роль не менялась с момента загрузки или прошлого сохранения -
+    # связанная запись уже обработана
+    if not created and getattr(instance, '_saved_role', None) == instance.role:
+        return
+
+    if instance.role == _ROLE_CLIENT:
+        Client.objects.get_or_create(profile=instance)
+    elif instance.role == _ROLE_TRAINER:
+        Trainer.objects.get_or_create(
+            profile=instance,
+            defaults={
+                'specialization': 'Не указано',
+                'experience_years': 0
+            }
+        )
+    instance._saved_role = instance.role
+
+
+@receiver(pre_save, sender=Profile)
+def fill_profile_full_name(sender, instance, **kwargs):
     """
+    Заполняет денормализованное ФИО профиля, если пользователь
+    уже загружен в память (без дополнительного запроса)
+    """
+    if not instance.full_name or Profile.user.is_cached(instance):
+        instance.full_name = instance.user.get_full_name() or instance.user.username
+
+
+@receiver(post_save, sender=User)
+def sync_profile_full_name(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Обновляет ФИО в профиле при изменении имени пользователя
+    """
+    # Профиль нового пользователя заполнит fill_profile_full_name
     if created:
-        if instance.role == UserRole.CLIENT:
-            # Создаём запись Client, если её ещё нет
-            if not hasattr(instance, 'client_info'):
-                Client.objects.create(profile=instance)
-        elif instance.role == UserRole.TRAINER:
-            # Создаём запись Trainer, если её ещё нет
-            if not hasattr(instance, 'trainer_info'):
-                Trainer.objects.create(
-                    profile=instance,
-                    specialization='Не указано',
-                    experience_years=0
-                )
-    else:
-        # Если роль изменилась, создаём соответствующую запись
-        if instance.role == UserRole.CLIENT and not hasattr(instance, 'client_info'):
-            Client.objects.create(profile=instance)
-        elif instance.role == UserRole.TRAINER and not hasattr(instance, 'trainer_info'):
-            Trainer.objects.create(
-                profile=instance,
-                specialization='Не указано',
-                experience_years=0
-            )
+        return
+    if update_fields is not None and not {'username', 'first_name', 'last_name'} & set(update_fields):
+        return
+
+    Profile.objects.filter(user=instance).update(
+        full_name=instance.get_full_name() or instance.username
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Сбрасывает кешированного пользователя (CachedModelBackend)
+    """
+    invalidate_user_cache(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_user_profile(sender, instance, **kwargs):
+    """
+    Профиль хранится в кеше вместе с пользователем
+    """
+    invalidate_user_cache(instance.user_id)
+
+
+@receiver(user_logged_out)
+def invalidate_cached_user_on_logout(sender, request, user, **kwargs):
+    """
+    При выходе пользователь удаляется из кеша
+    """
+    if user is not None:
+        invalidate_user_cache(user.pk)
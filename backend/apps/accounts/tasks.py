@@ -2,27 +2,37 @@
 Celery задачи для аккаунтов и уведомлений
 """
 
+import logging
+from smtplib import SMTPException
+from string import Template
+
 from celery import shared_task
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 from django.conf import settings
 
+try:
+    from django_redis import get_redis_connection
+except ImportError:  # кеш без django-redis: письма отправляются без очереди
+    get_redis_connection = None
 
-@shared_task
-def send_welcome_email(user_id):
-    """
-    Отправляет приветственное письмо новому пользователю
+logger = logging.getLogger(__name__)
 
-    Args:
-        user_id: ID пользователя
-    """
-    from django.contrib.auth.models import User
+# Redis-список user_id, ожидающих приветственного письма
+WELCOME_EMAIL_QUEUE_KEY = 'sportclub:welcome_email_queue'
+WELCOME_EMAIL_BATCH_SIZE = 100
 
-    try:
-        user = User.objects.get(id=user_id)
+# Повторы неотправленных писем при временных ошибках SMTP
+WELCOME_EMAIL_MAX_RETRIES = 3
+WELCOME_EMAIL_RETRY_DELAY = 30  # секунд
+
+# Колонки User, нужные для письма
+WELCOME_EMAIL_USER_FIELDS = ('email', 'first_name', 'last_name', 'username')
+
+WELCOME_EMAIL_SUBJECT = 'Добро пожаловать в АС УСК!'
 
-        subject = 'Добро пожаловать в АС УСК!'
-        message = f"""
-Здравствуйте, {user.get_full_name() or user.username}!
+# Текст письма собирается один раз при импорте, в задаче подставляется только имя
+WELCOME_EMAIL_TEMPLATE = Template("""
+Здравствуйте, $name!
 
 Добро пожаловать в нашу систему управления спортивным клубом АС УСК!
 
@@ -46,19 +56,160 @@ def send_welcome_email(user_id):
 
 ---
 Это автоматическое письмо. Пожалуйста, не отвечайте на него.
-        """
-
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
+""")
+
+
+def _build_welcome_message(user):
+    """Текст приветственного письма для пользователя"""
+    return WELCOME_EMAIL_TEMPLATE.substitute(name=user.get_full_name() or user.username)
+
+
+def queue_welcome_email(user_id):
+    """
+    Ставит приветственное письмо в очередь на пакетную отправку
+    (её разбирает dispatch_welcome_emails по расписанию Celery Beat).
+    Без django-redis письмо сразу уходит пачкой из одного пользователя
+    """
+    if get_redis_connection is None:
+        send_welcome_emails_batch.delay([user_id])
+        return
+    get_redis_connection('default').rpush(WELCOME_EMAIL_QUEUE_KEY, user_id)
+
+
+@shared_task(queue='emails', ignore_result=True)
+def dispatch_welcome_emails():
+    """
+    Забирает из Redis до WELCOME_EMAIL_BATCH_SIZE ожидающих user_id
+    и отправляет их одной пакетной задачей
+
+    LRANGE + LTRIM в одной транзакции вместо LPOP с count,
+    который есть только начиная с Redis 6.2. Снятые из списка id не теряются:
+    неотправленные письма повторяет send_welcome_emails_batch.
+    Запускается каждые несколько секунд (настроено в config/celery.py)
+    """
+    if get_redis_connection is None:
+        return
+
+    pipe = get_redis_connection('default').pipeline(transaction=True)
+    pipe.lrange(WELCOME_EMAIL_QUEUE_KEY, 0, WELCOME_EMAIL_BATCH_SIZE - 1)
+    pipe.ltrim(WELCOME_EMAIL_QUEUE_KEY, WELCOME_EMAIL_BATCH_SIZE, -1)
+    user_ids, _ = pipe.execute()
+    if not user_ids:
+        return
+
+    send_welcome_emails_batch.apply_async(
+        args=[[int(user_id) for user_id in user_ids]],
+        ignore_result=True,
+    )
+    logger.info("В отправку передано %s писем", len(user_ids))
+
+
+def _send_welcome_emails(users):
+    """
+    Отправляет приветственные письма через одно SMTP соединение.
+    Отправка прерывается, если не удалась треть писем (SMTP, вероятно, недоступен)
+
+    Returns:
+        (id пользователей без отправленного письма, последняя ошибка SMTP)
+    """
+    max_failures = max(1, len(users) // 3)
+    sent_ids = set()
+    failed_count = 0
+    error = None
+
+    # Одно SMTP соединение на пачку: открывается здесь и закрывается после неё
+    try:
+        with get_connection(fail_silently=False) as connection:
+            for user in users:
+                email = EmailMessage(
+                    subject=WELCOME_EMAIL_SUBJECT,
+                    body=_build_welcome_message(user),
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[user.email],
+                    connection=connection,
+                )
+                try:
+                    email.send(fail_silently=False)
+                    sent_ids.add(user.id)
+                except (SMTPException, OSError) as e:
+                    error = e
+                    failed_count += 1
+                    logger.error("Ошибка при отправке welcome email пользователю %s: %s", user.email, e)
+                    if failed_count >= max_failures:
+                        break
+    except (SMTPException, OSError) as e:
+        # Не удалось открыть или закрыть соединение
+        error = e
+        logger.error("SMTP недоступен при отправке welcome email: %s", e)
+
+    logger.info("Отправлено %s из %s welcome email", len(sent_ids), len(users))
+    return [user.id for user in users if user.id not in sent_ids], error
+
+
+def _retry_unsent(task, retry_args, unsent_ids, error):
+    """
+    Повторяет задачу с аргументами retry_args для неотправленных писем.
+    После WELCOME_EMAIL_MAX_RETRIES повторов только пишет в лог, кому письмо не ушло
+    """
+    if task.request.retries >= task.max_retries:
+        logger.error(
+            "Welcome email не отправлен пользователям %s после %s повторов", unsent_ids, task.max_retries
         )
+        return
+    raise task.retry(args=retry_args, exc=error)
+
+
+@shared_task(
+    bind=True,
+    queue='emails',
+    acks_late=True,
+    ignore_result=True,
+    max_retries=WELCOME_EMAIL_MAX_RETRIES,
+    default_retry_delay=WELCOME_EMAIL_RETRY_DELAY,
+)
+def send_welcome_emails_batch(self, user_ids):
+    """
+    Отправляет приветственные письма пачкой через одно SMTP соединение.
+    Неотправленные письма (ошибка SMTP или прерванная пачка) повторяются
+    отдельной попыткой задачи, не более WELCOME_EMAIL_MAX_RETRIES раз
+
+    Args:
+        user_ids: список ID пользователей
+    """
+    from django.contrib.auth.models import User
+
+    users = list(User.objects.only(*WELCOME_EMAIL_USER_FIELDS).filter(id__in=user_ids))
+    if not users:
+        return
+
+    unsent_ids, error = _send_welcome_emails(users)
+    if unsent_ids:
+        _retry_unsent(self, [unsent_ids], unsent_ids, error)
+
+
+@shared_task(
+    bind=True,
+    queue='emails',
+    acks_late=True,
+    ignore_result=True,
+    max_retries=WELCOME_EMAIL_MAX_RETRIES,
+    default_retry_delay=WELCOME_EMAIL_RETRY_DELAY,
+)
+def send_welcome_email(self, user_id):
+    """
+    Приветственное письмо одному пользователю (для задач, поставленных
+    в очередь до перехода на send_welcome_emails_batch).
+    При ошибке SMTP повторяется, как и пакетная отправка
+
+    Args:
+        user_id: ID пользователя
+    """
+    from django.contrib.auth.models import User
 
-        return f"Welcome email отправлен пользователю {user.email}"
+    users = list(User.objects.only(*WELCOME_EMAIL_USER_FIELDS).filter(id=user_id))
+    if not users:
+        return
 
-    except User.DoesNotExist:
-        return f"Пользователь с ID {user_id} не найден"
-    except Exception as e:
-        return f"Ошибка при отправке welcome email: {e}"
+    unsent_ids, error = _send_welcome_emails(users)
+    if unsent_ids:
+        _retry_unsent(self, [user_id], unsent_ids, error)
@@ -1,32 +1,124 @@
 """
 Custom template filters for markdown rendering
 """
+import re
+import threading
+from functools import lru_cache
+
 from django import template
 from django.utils.safestring import mark_safe
 import markdown2
+import nh3
 
 register = template.Library()
 
+# Расширения markdown2 для таблиц, списков и т.д.
+MARKDOWN_EXTRAS = (
+    'tables',           # Поддержка таблиц
+    'fenced-code-blocks',  # Блоки кода ```
+    'strike',           # Зачёркнутый текст
+    'task_list',        # Чекбоксы [ ] и [x]
+    'cuddled-lists',    # Лучшая обработка списков
+    'header-ids',       # ID для заголовков
+)
+
+# Разметка, которую оставляет санитайзер: набор nh3 по умолчанию
+# плюс то, что генерируют расширения выше (чекбоксы, id заголовков, подсветка кода)
+MARKDOWN_ALLOWED_TAGS = nh3.ALLOWED_TAGS | {'input'}
+MARKDOWN_ALLOWED_ATTRIBUTES = {
+    **nh3.ALLOWED_ATTRIBUTES,
+    **{f'h{level}': {'id'} for level in range(1, 7)},
+    'div': {'class'},
+    'span': {'class'},
+    'code': {'class'},
+    'input': {'type', 'class', 'checked', 'disabled'},
+}
+
+# Однострочный текст без этих символов markdown2 лишь оборачивает в <p>
+PLAIN_TEXT_STOP_CHARS = frozenset('\\`*_[]<>&#+-!|~\t\r\n')
+ORDERED_LIST_START_RE = re.compile(r'\d+\.')
+
+# Короткие тексты рендерятся быстро, в кэш попадают только длинные (планы AI тренера)
+MARKDOWN_CACHE_MIN_LENGTH = 256
+
+# Документ, задействующий все расширения: прогревает ленивые регулярки markdown2
+MARKDOWN_WARMUP_TEXT = (
+    '# Warmup\n\n'
+    '| a | b |\n|---|---|\n| 1 | 2 |\n\n'
+    '- [ ] task\n- [x] ~~done~~ **bold** *em* [link](http://example.com)\n\n'
+    '1. one\n2. two\n\n'
+    '```python\nx = 1\n```\n'
+)
+
+# Конвертер хранит состояние между вызовами, поэтому он свой у каждого потока
+_local = threading.local()
+
+
+def _get_converter():
+    converter = getattr(_local, 'converter', None)
+    if converter is None:
+        converter = _local.converter = markdown2.Markdown(extras=list(MARKDOWN_EXTRAS))
+    return converter
+
+
+def _render_markdown(text):
+    """Рендерит Markdown в очищенный HTML"""
+    return nh3.clean(
+        _get_converter().convert(text),
+        tags=MARKDOWN_ALLOWED_TAGS,
+        attributes=MARKDOWN_ALLOWED_ATTRIBUTES,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _render_markdown_cached(text):
+    """
+    То же, что _render_markdown; повторные одинаковые тексты
+    (планы AI тренера) берутся из кэша вместе с результатом очистки
+    """
+    return _render_markdown(text)
+
+
+def warm_up_markdown():
+    """
+    Компилирует регулярки markdown2 и nh3 заранее (вызывается из
+    AccountsConfig.ready), чтобы первый запрос не платил за это
+    """
+    _render_markdown(MARKDOWN_WARMUP_TEXT)
+
+
+def render_safe_markdown(text):
+    """
+    Конвертирует Markdown текст в безопасный HTML за один проход:
+    рендеринг markdown2 и очистка nh3
+    """
+    if not text:
+        return ''
+
+    text = str(text)
+    # Простой текст без <, > и & очищать нечего
+    if _is_plain_text(text):
+        return mark_safe(f'<p>{text}</p>\n')
+
+    if len(text) < MARKDOWN_CACHE_MIN_LENGTH:
+        return mark_safe(_render_markdown(text))
+    return mark_safe(_render_markdown_cached(text))
+
 
 @register.filter(name='markdown')
 def markdown_format(text):
     """
     Конвертирует Markdown текст в HTML с поддержкой таблиц и extras
     """
-    if not text:
-        return ''
+    return render_safe_markdown(text)
 
-    # Используем markdown2 с расширениями для таблиц, списков и т.д.
-    html = markdown2.markdown(
-        text,
-        extras=[
-            'tables',           # Поддержка таблиц
-            'fenced-code-blocks',  # Блоки кода ```
-            'strike',           # Зачёркнутый текст
-            'task_list',        # Чекбоксы [ ] и [x]
-            'cuddled-lists',    # Лучшая обработка списков
-            'header-ids',       # ID для заголовков
-        ]
-    )
 
-    return mark_safe(html)
+def _is_plain_text(text):
+    """
+    Быстрая проверка: markdown2 отрендерит текст как один абзац без изменений
+    """
+    return (
+        text == text.strip()
+        and PLAIN_TEXT_STOP_CHARS.isdisjoint(text)
+        and not ORDERED_LIST_START_RE.match(text)
+    )
@@ -0,0 +1,156 @@
+"""
+Тесты для CachedModelBackend (пользователь и профиль из кеша)
+"""
+
+import pytest
+from django.contrib import auth
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.accounts.backends import CachedModelBackend, user_cache_key
+from apps.accounts.models import Profile
+from core.patterns.singleton import cache_manager
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Каждый тест начинается с пустого кеша"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.unit
+class TestCachedModelBackend:
+    """Тесты загрузки пользователя по id через кеш"""
+
+    def test_cache_miss_loads_user_with_profile(self, test_client_user, django_assert_num_queries):
+        """При промахе пользователь и профиль загружаются одним запросом и кешируются"""
+        backend = CachedModelBackend()
+
+        with django_assert_num_queries(1):
+            user = backend.get_user(test_client_user.pk)
+            assert user.profile.phone == '+79991234567'
+
+        assert user == test_client_user
+        assert cache_manager.get(user_cache_key(test_client_user.pk)) is not None
+
+    def test_cache_hit_does_not_query_db(self, test_client_user, django_assert_num_queries):
+        """При попадании в кеш БД не используется"""
+        backend = CachedModelBackend()
+        backend.get_user(test_client_user.pk)
+
+        with django_assert_num_queries(0):
+            user = backend.get_user(test_client_user.pk)
+            assert user.username == test_client_user.username
+            assert user.profile.role == test_client_user.profile.role
+
+    def test_cached_value_is_plain_data(self, test_client_user):
+        """В кеше хранятся значения колонок, а не экземпляры моделей"""
+        CachedModelBackend().get_user(test_client_user.pk)
+
+        cached = cache_manager.get(user_cache_key(test_client_user.pk))
+        assert isinstance(cached, dict)
+        assert cached['username'] == test_client_user.username
+        assert 'password' not in cached
+
+    def test_session_verified_from_cache(self, plain_client, test_client_user, django_assert_num_queries):
+        """Проверка хеша сессии на попадании в кеш не загружает пароль из БД"""
+        plain_client.force_login(test_client_user)
+        request = RequestFactory().get('/')
+        request.session = plain_client.session
+        request.session.load()
+        CachedModelBackend().get_user(test_client_user.pk)
+
+        with django_assert_num_queries(0):
+            assert auth.get_user(request) == test_client_user
+
+    def test_password_change_ends_session(self, plain_client, test_client_user,
+                                          django_capture_on_commit_callbacks):
+        """После смены пароля закешированный хеш сессии не используется"""
+        plain_client.force_login(test_client_user)
+        request = RequestFactory().get('/')
+        request.session = plain_client.session
+        CachedModelBackend().get_user(test_client_user.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            test_client_user.set_password('NewPass456!')
+            test_client_user.save()
+
+        assert not auth.get_user(request).is_authenticated
+
+    def test_user_without_profile(self, test_user):
+        """Пользователь без профиля загружается без профиля"""
+        user = CachedModelBackend().get_user(test_user.pk)
+
+        assert user == test_user
+        assert not hasattr(user, 'profile')
+
+    def test_missing_user(self):
+        """Несуществующий пользователь не кешируется"""
+        assert CachedModelBackend().get_user(999999) is None
+        assert cache_manager.get(user_cache_key(999999)) is None
+
+    def test_inactive_user_rejected(self, test_user):
+        """Неактивный пользователь не проходит user_can_authenticate"""
+        User.objects.filter(pk=test_user.pk).update(is_active=False)
+
+        assert CachedModelBackend().get_user(test_user.pk) is None
+
+
+@pytest.mark.unit
+class TestUserCacheInvalidation:
+    """Тесты сброса кеша пользователя"""
+
+    def test_user_save_invalidates(self, test_client_user, django_capture_on_commit_callbacks):
+        """Сохранение User сбрасывает кеш"""
+        backend = CachedModelBackend()
+        backend.get_user(test_client_user.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            test_client_user.first_name = 'Changed'
+            test_client_user.save()
+
+        assert cache_manager.get(user_cache_key(test_client_user.pk)) is None
+        assert backend.get_user(test_client_user.pk).first_name == 'Changed'
+
+    def test_profile_save_invalidates(self, test_client_user, django_capture_on_commit_callbacks):
+        """Сохранение Profile сбрасывает кеш пользователя"""
+        backend = CachedModelBackend()
+        backend.get_user(test_client_user.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            profile = Profile.objects.get(user=test_client_user)
+            profile.address = 'Новый адрес'
+            profile.save()
+
+        assert backend.get_user(test_client_user.pk).profile.address == 'Новый адрес'
+
+    def test_logout_invalidates(self, plain_client, test_client_user, django_capture_on_commit_callbacks):
+        """Выход пользователя сбрасывает кеш"""
+        plain_client.force_login(test_client_user)
+        CachedModelBackend().get_user(test_client_user.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            plain_client.logout()
+
+        assert cache_manager.get(user_cache_key(test_client_user.pk)) is None
+
+    def test_edit_profile_view_invalidates(self, plain_client, test_client_user,
+                                           django_capture_on_commit_callbacks):
+        """edit_profile_view (UPDATE через queryset) сбрасывает кеш"""
+        plain_client.force_login(test_client_user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            plain_client.post(reverse('accounts_web:edit_profile'), {
+                'first_name': 'Новое',
+                'last_name': 'Имя',
+                'email': test_client_user.email,
+                'phone': '+79991234567',
+            })
+
+        user = CachedModelBackend().get_user(test_client_user.pk)
+        assert user.first_name == 'Новое'
+        assert user.profile.full_name == 'Новое Имя'
@@ -0,0 +1,96 @@
+"""
+Тесты для Celery задач приложения accounts (приветственные письма)
+"""
+
+from smtplib import SMTPServerDisconnected
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+
+from apps.accounts.tasks import WELCOME_EMAIL_MAX_RETRIES, send_welcome_email, send_welcome_emails_batch
+
+LOCMEM_SEND = 'django.core.mail.backends.locmem.EmailBackend.send_messages'
+
+
+def _failing_send(failures):
+    """send_messages locmem-бэкенда, который первые failures вызовов падает"""
+    calls = []
+    original = EmailBackend.send_messages
+
+    def send_messages(backend, messages):
+        calls.append(messages[0].to[0])
+        if len(calls) <= failures:
+            raise SMTPServerDisconnected('Connection unexpectedly closed')
+        return original(backend, messages)
+
+    return send_messages, calls
+
+
+@pytest.fixture
+def users(create_user):
+    """Два пользователя для пачки писем"""
+    return [create_user(), create_user()]
+
+
+def _emails(users):
+    return sorted(user.email for user in users)
+
+
+@pytest.mark.unit
+class TestSendWelcomeEmailsBatch:
+    """Тесты пакетной отправки приветственных писем"""
+
+    def test_sends_one_email_per_user(self, users):
+        """Каждый пользователь пачки получает письмо"""
+        send_welcome_emails_batch.apply(args=[[user.pk for user in users]])
+
+        assert sorted(m.to[0] for m in mail.outbox) == _emails(users)
+
+    def test_unsent_emails_are_retried(self, users):
+        """Письма, не ушедшие из-за ошибки SMTP, отправляются повтором задачи"""
+        send_messages, calls = _failing_send(failures=1)
+
+        with patch(LOCMEM_SEND, send_messages):
+            send_welcome_emails_batch.apply(args=[[user.pk for user in users]])
+
+        # Первая ошибка прерывает пачку из двух писем, повтор отправляет оба
+        assert len(calls) == 3
+        assert sorted(m.to[0] for m in mail.outbox) == _emails(users)
+
+    def test_retries_are_bounded(self, test_user):
+        """При постоянной ошибке SMTP задача повторяется не более WELCOME_EMAIL_MAX_RETRIES раз"""
+        send_messages, calls = _failing_send(failures=100)
+
+        with patch(LOCMEM_SEND, send_messages):
+            result = send_welcome_emails_batch.apply(args=[[test_user.pk]])
+
+        assert result.successful()
+        assert len(calls) == WELCOME_EMAIL_MAX_RETRIES + 1
+        assert mail.outbox == []
+
+
+@pytest.mark.unit
+class TestSendWelcomeEmail:
+    """Тесты отправки одного приветственного письма"""
+
+    def test_retried_on_smtp_error(self, test_user):
+        """Временная ошибка SMTP повторяет задачу, письмо уходит со второй попытки"""
+        send_messages, calls = _failing_send(failures=1)
+
+        with patch(LOCMEM_SEND, send_messages):
+            send_welcome_email.apply(args=[test_user.pk])
+
+        assert len(calls) == 2
+        assert [m.to[0] for m in mail.outbox] == [test_user.email]
+
+    def test_retries_are_bounded(self, test_user):
+        """При постоянной ошибке SMTP задача повторяется не более WELCOME_EMAIL_MAX_RETRIES раз"""
+        send_messages, calls = _failing_send(failures=100)
+
+        with patch(LOCMEM_SEND, send_messages):
+            result = send_welcome_email.apply(args=[test_user.pk])
+
+        assert result.successful()
+        assert len(calls) == WELCOME_EMAIL_MAX_RETRIES + 1
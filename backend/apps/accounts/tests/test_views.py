@@ -0,0 +1,338 @@
+"""
+Integration тесты для API views приложения accounts
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, reverse_lazy
+from rest_framework import status
+from django.contrib.auth.models import User
+
+from apps.accounts.models import Profile, Client, UserRole
+
+
+# URL без параметров: reverse_lazy, чтобы импорт модуля не обращался к URLconf
+REGISTER_URL = reverse_lazy('accounts:register')
+PROFILE_URL = reverse_lazy('accounts:profile-detail')
+PROFILE_UPDATE_URL = reverse_lazy('accounts:profile-update')
+CLIENT_LIST_URL = reverse_lazy('accounts:client-list')
+CLIENT_STUDENTS_URL = reverse_lazy('accounts:client-students')
+TOKEN_URL = reverse_lazy('accounts:token_obtain_pair')
+TOKEN_REFRESH_URL = reverse_lazy('accounts:token_refresh')
+
+
+@pytest.mark.integration
+class TestRegistrationAPI:
+    """Тесты для API регистрации"""
+
+    def test_register_new_user_success(self, api_client):
+        """Тест успешной регистрации нового пользователя"""
+        url = REGISTER_URL
+        data = {
+            'username': 'newuser123',
+            'email': 'newuser@test.com',
+            'password': 'SecurePass123!',
+            'password2': 'SecurePass123!',
+            'first_name': 'New',
+            'last_name': 'User',
+            'phone': '+79001234567'
+        }
+
+        response = api_client.post(url, data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert 'id' in response.data
+        assert 'username' in response.data
+
+        # Проверяем что пользователь создан
+        assert User.objects.filter(username='newuser123').exists()
+
+        # Проверяем что профиль и клиент созданы
+        user = User.objects.get(username='newuser123')
+        assert hasattr(user, 'profile')
+        assert user.profile.role == UserRole.CLIENT
+
+    def test_register_password_mismatch(self, api_client):
+        """Тест регистрации с несовпадающими паролями"""
+        url = REGISTER_URL
+        data = {
+            'username': 'testuser',
+            'email': 'test@test.com',
+            'password': 'Pass123!',
+            'password2': 'DifferentPass123!',
+            'phone': '+79001111111'
+        }
+
+        response = api_client.post(url, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'password' in response.data
+
+    def test_register_duplicate_username(self, api_client, test_user):
+        """Тест регистрации с существующим username"""
+        url = REGISTER_URL
+        data = {
+            'username': test_user.username,  # Уже существует
+            'email': 'newemail@test.com',
+            'password': 'Pass123!',
+            'password2': 'Pass123!',
+            'phone': '+79002222222'
+        }
+
+        response = api_client.post(url, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_register_weak_password(self, api_client, settings):
+        """Тест регистрации со слабым паролем"""
+        # В config.settings.dev валидаторы паролей отключены
+        settings.AUTH_PASSWORD_VALIDATORS = [
+            {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
+            {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
+        ]
+        url = REGISTER_URL
+        data = {
+            'username': 'newuser',
+            'email': 'new@test.com',
+            'password': '123',  # Слишком простой
+            'password2': '123',
+            'phone': '+79003333333'
+        }
+
+        response = api_client.post(url, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.integration
+class TestProfileAPI:
+    """Тесты для API профиля"""
+
+    def test_get_own_profile(self, authenticated_client, test_client_user):
+        """Тест получения своего профиля"""
+        url = PROFILE_URL
+
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['username'] == test_client_user.username
+        assert response.data['email'] == test_client_user.email
+
+    def test_get_profile_unauthorized(self, plain_client):
+        """Тест получения профиля без авторизации"""
+        url = PROFILE_URL
+
+        response = plain_client.get(url)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_update_own_profile(self, authenticated_client, test_client_user):
+        """Тест обновления своего профиля"""
+        url = PROFILE_UPDATE_URL
+        data = {
+            'email': 'updated@test.com',
+            'first_name': 'UpdatedName',
+            'phone': '+79009999999'
+        }
+
+        response = authenticated_client.patch(url, data, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+
+        # Проверяем что данные обновились
+        test_client_user.refresh_from_db()
+        assert test_client_user.email == 'updated@test.com'
+        assert test_client_user.first_name == 'UpdatedName'
+
+
+@pytest.mark.integration
+class TestClientAPI:
+    """Тесты для API клиентов (только для админов)"""
+
+    def test_list_clients_as_admin(self, admin_client):
+        """Тест получения списка клиентов админом"""
+        url = CLIENT_LIST_URL
+
+        response = admin_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'results' in response.data or isinstance(response.data, list)
+
+    def test_list_clients_query_count_is_constant(self, admin_client):
+        """Число запросов списка клиентов не зависит от количества клиентов"""
+        url = CLIENT_LIST_URL
+
+        def create_clients(start, count):
+            # Client создаётся сигналом при создании Profile
+            for i in range(start, start + count):
+                user = User.objects.create_user(username=f'listclient{i}', password='testpass123')
+                Profile.objects.create(user=user, role=UserRole.CLIENT, phone=f'+7998{i:07d}')
+
+        create_clients(0, 1)
+
+        with CaptureQueriesContext(connection) as small:
+            admin_client.get(url)
+
+        create_clients(1, 5)
+
+        with CaptureQueriesContext(connection) as large:
+            response = admin_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+    def test_list_students(self, admin_client):
+        """Тест списка студентов: те же записи ClientSerializer, что и в списке клиентов"""
+        for i, is_student in enumerate([True, False]):
+            user = User.objects.create_user(
+                username=f'student{i}', password='testpass123', first_name='Иван', last_name='Петров'
+            )
+            profile = Profile.objects.create(user=user, role=UserRole.CLIENT, phone=f'+7997{i:07d}')
+            Client.objects.filter(profile=profile).update(is_student=is_student)
+
+        url = CLIENT_STUDENTS_URL
+        response = admin_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 1
+        student = response.data['results'][0]
+        assert student['profile']['username'] == 'student0'
+        assert student['full_name'] == 'Иван Петров'
+        assert student['profile']['phone'] == '+79970000000'
+        assert student['is_student'] is True
+
+    def test_list_clients_as_regular_user(self, authenticated_client):
+        """Тест получения списка клиентов обычным пользователем"""
+        url = CLIENT_LIST_URL
+
+        response = authenticated_client.get(url)
+
+        # Должен быть запрещён доступ
+        assert response.status_code in [status.HTTP_403_FORBIDDEN, status.HTTP_401_UNAUTHORIZED]
+
+    def test_create_client_as_admin(self, admin_client):
+        """Тест создания клиента админом"""
+        url = CLIENT_LIST_URL
+        data = {
+            'username': 'admincreated',
+            'email': 'admincreated@test.com',
+            'password': 'AdminPass123!',
+            'first_name': 'Admin',
+            'last_name': 'Created',
+            'phone': '+79008888888',
+            'is_student': True
+        }
+
+        response = admin_client.post(url, data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Client.objects.filter(profile__user__username='admincreated').exists()
+
+    def test_get_client_detail(self, admin_client, test_client):
+        """Тест получения деталей клиента"""
+        url = reverse('accounts:client-detail', kwargs={'pk': test_client.id})
+
+        response = admin_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['id'] == test_client.id
+
+    def test_update_client_as_admin(self, admin_client, test_client):
+        """Тест обновления клиента админом"""
+        url = reverse('accounts:client-detail', kwargs={'pk': test_client.id})
+        data = {
+            'is_student': True,
+            'emergency_contact': 'Emergency Person'
+        }
+
+        response = admin_client.patch(url, data, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+
+        test_client.refresh_from_db()
+        assert test_client.is_student is True
+        assert test_client.emergency_contact == 'Emergency Person'
+
+
+@pytest.mark.integration
+class TestTrainerAPI:
+    """Тесты для API тренеров (только для админов)"""
+
+    def test_update_trainer(self, admin_client, test_trainer):
+        """Тест обновления тренера: ответ в формате TrainerSerializer"""
+        url = reverse('accounts:trainer-detail', args=[test_trainer.id])
+
+        response = admin_client.patch(url, {'specialization': 'Плавание'}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['specialization'] == 'Плавание'
+        assert 'profile' in response.data
+
+        test_trainer.refresh_from_db()
+        assert test_trainer.specialization == 'Плавание'
+
+
+@pytest.mark.integration
+class TestLoginAPI:
+    """Тесты для API авторизации (JWT)"""
+
+    def test_login_with_valid_credentials(self, api_client, test_user):
+        """Тест входа с валидными credentials"""
+        url = TOKEN_URL
+        data = {
+            'username': test_user.username,
+            'password': 'testpass123'
+        }
+
+        response = api_client.post(url, data, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'access' in response.data
+        assert 'refresh' in response.data
+
+    def test_login_with_invalid_password(self, plain_client, test_user):
+        """Тест входа с неверным паролем"""
+        url = TOKEN_URL
+        data = {
+            'username': test_user.username,
+            'password': 'wrongpassword'
+        }
+
+        response = plain_client.post(url, data, content_type='application/json')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_login_with_nonexistent_user(self, plain_client):
+        """Тест входа с несуществующим пользователем"""
+        url = TOKEN_URL
+        data = {
+            'username': 'nonexistent',
+            'password': 'somepass'
+        }
+
+        response = plain_client.post(url, data, content_type='application/json')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_refresh_token(self, api_client, test_user):
+        """Тест обновления access token через refresh token"""
+        # Сначала получаем токены
+        login_url = TOKEN_URL
+        login_data = {
+            'username': test_user.username,
+            'password': 'testpass123'
+        }
+        login_response = api_client.post(login_url, login_data, format='json')
+        refresh_token = login_response.data['refresh']
+
+        # Обновляем access token
+        refresh_url = TOKEN_REFRESH_URL
+        refresh_data = {
+            'refresh': refresh_token
+        }
+
+        response = api_client.post(refresh_url, refresh_data, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'access' in response.data
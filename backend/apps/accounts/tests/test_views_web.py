@@ -0,0 +1,147 @@
+"""
+Integration тесты для web views приложения accounts (Django templates)
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from apps.accounts.models import Profile, UserRole
+from apps.bookings.models import Booking, BookingStatus
+from apps.classes.models import Class, ClassStatus
+
+TRAINERS_LIST_URL = reverse_lazy('accounts_web:trainers_list')
+TRAINER_DASHBOARD_URL = reverse_lazy('accounts_web:trainer_dashboard')
+REGISTER_URL = reverse_lazy('accounts_web:register')
+EDIT_PROFILE_URL = reverse_lazy('accounts_web:edit_profile')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кеш пользователя не переносится между тестами"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.integration
+class TestRegisterView:
+    """Тесты страницы регистрации"""
+
+    def test_invalid_phone_shows_form_error(self, plain_client):
+        """Телефон, отклонённый CHECK-ограничением БД, даёт ошибку формы, а не 500"""
+        response = plain_client.post(REGISTER_URL, {
+            'username': 'badphone',
+            'email': 'badphone@example.com',
+            'password': 'StrongPass123!',
+            'password2': 'StrongPass123!',
+            'phone': 'not-a-phone',
+        })
+
+        assert response.status_code == 200
+        assert [str(m) for m in response.context['messages']] == [Profile.phone_regex.message]
+        assert not User.objects.filter(username='badphone').exists()
+
+
+@pytest.mark.integration
+class TestEditProfileView:
+    """Тесты страницы редактирования профиля"""
+
+    def test_save_updates_timestamp(self, plain_client, test_client_user):
+        """Сохранение только изменённых колонок обновляет и updated_at"""
+        profile = test_client_user.profile
+        Profile.objects.filter(pk=profile.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        plain_client.force_login(test_client_user)
+
+        response = plain_client.post(EDIT_PROFILE_URL, {
+            'first_name': test_client_user.first_name,
+            'last_name': test_client_user.last_name,
+            'email': test_client_user.email,
+            'phone': '+79991234567',
+            'address': 'Новый адрес',
+        })
+
+        assert response.status_code == 302
+        profile.refresh_from_db()
+        assert profile.address == 'Новый адрес'
+        assert timezone.now() - profile.updated_at < timedelta(minutes=1)
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries.captured_queries)
+
+
+@pytest.mark.integration
+class TestTrainersListView:
+    """Тесты страницы списка тренеров"""
+
+    def test_query_count_is_constant(self, plain_client):
+        """Шаблон читает только загруженные колонки: число запросов не растёт"""
+
+        def create_trainers(start, count):
+            # Trainer создаётся сигналом при создании Profile
+            for i in range(start, start + count):
+                user = User.objects.create_user(
+                    username=f'listtrainer{i}', first_name='Анна', last_name=f'Тренер{i}',
+                    email=f'listtrainer{i}@example.com'
+                )
+                Profile.objects.create(user=user, role=UserRole.TRAINER, phone=f'+7996{i:07d}')
+
+        create_trainers(0, 1)
+        small = _count_queries(plain_client, TRAINERS_LIST_URL)
+
+        create_trainers(1, 4)
+        large = _count_queries(plain_client, TRAINERS_LIST_URL)
+
+        assert large == small
+
+
+@pytest.mark.integration
+class TestTrainerDashboardView:
+    """Тесты личного кабинета тренера"""
+
+    def test_query_count_is_constant(self, plain_client, test_trainer_user, test_trainer,
+                                     test_class_type, test_room, create_client):
+        """Число запросов не зависит от числа занятий и записанных клиентов"""
+        plain_client.force_login(test_trainer_user)
+        now = timezone.now()
+
+        def create_classes(days, clients_per_class):
+            # Предстоящее и прошедшее занятие на расстоянии days от now
+            for offset in (days, -days):
+                class_instance = Class.objects.create(
+                    class_type=test_class_type,
+                    trainer=test_trainer,
+                    room=test_room,
+                    datetime=now + timedelta(days=offset),
+                    duration_minutes=60,
+                    max_capacity=15,
+                    status=ClassStatus.SCHEDULED
+                )
+                for _ in range(clients_per_class):
+                    Booking.objects.create(
+                        client=create_client(),
+                        class_instance=class_instance,
+                        status=BookingStatus.CONFIRMED
+                    )
+
+        create_classes(3, 1)
+        # Первый запрос кладёт пользователя в кеш (CachedModelBackend)
+        plain_client.get(TRAINER_DASHBOARD_URL)
+        small = _count_queries(plain_client, TRAINER_DASHBOARD_URL)
+
+        # Новое ближайшее занятие с несколькими клиентами и ещё одно позже
+        create_classes(1, 3)
+        create_classes(2, 2)
+        large = _count_queries(plain_client, TRAINER_DASHBOARD_URL)
+
+        assert large == small
@@ -3,21 +3,31 @@ API URL configuration for accounts app
 """
 
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from django.utils.module_loading import import_string
+from rest_framework.routers import SimpleRouter
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from . import views
 
 app_name = 'accounts'
 
+# Resolve JWT serializers once here instead of import_string() on every request
+token_obtain_pair_view = TokenObtainPairView.as_view(
+    serializer_class=import_string(jwt_settings.TOKEN_OBTAIN_SERIALIZER)
+)
+token_refresh_view = TokenRefreshView.as_view(
+    serializer_class=import_string(jwt_settings.TOKEN_REFRESH_SERIALIZER)
+)
+
 # Create router for ViewSets
-router = DefaultRouter()
+router = SimpleRouter()
 router.register(r'clients', views.ClientViewSet, basename='client')
 router.register(r'trainers', views.TrainerViewSet, basename='trainer')
 
 urlpatterns = [
     # JWT Authentication
-    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/', token_obtain_pair_view, name='token_obtain_pair'),
+    path('token/refresh/', token_refresh_view, name='token_refresh'),
     path('register/', views.RegisterView.as_view(), name='register'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
 
@@ -13,7 +13,7 @@ from .models import Profile, Client, Trainer
 from .serializers import (
     RegisterSerializer, ProfileSerializer,
     ClientSerializer, ClientCreateSerializer, ClientUpdateSerializer,
-    TrainerSerializer
+    TrainerSerializer, TrainerUpdateSerializer
 )
 
 
@@ -77,8 +77,8 @@ class ClientViewSet(viewsets.ModelViewSet):
     queryset = Client.objects.select_related('profile__user').all()
     permission_classes = [IsAdminUser]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['profile__user__first_name', 'profile__user__last_name', 'profile__user__email', 'profile__phone']
-    ordering_fields = ['profile__created_at', 'profile__user__first_name']
+    search_fields = ['profile__full_name', 'profile__user__email', 'profile__phone']
+    ordering_fields = ['profile__created_at', 'profile__user__first_name', 'profile__full_name']
     ordering = ['-profile__created_at']
 
     def get_serializer_class(self):
@@ -89,6 +89,13 @@ class ClientViewSet(viewsets.ModelViewSet):
             return ClientUpdateSerializer
         return ClientSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        return queryset
+
     def perform_destroy(self, instance):
         """
         Soft delete: deactivate user instead of deleting
@@ -107,8 +114,15 @@ class ClientViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def students(self, request):
-        """Get list of student clients"""
-        students = self.queryset.filter(is_student=True)
+        """
+        Get paginated list of student clients (search/ordering as in list),
+        serialized like the list endpoint
+        """
+        students = self.filter_queryset(self.get_queryset().filter(is_student=True))
+        page = self.paginate_queryset(students)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(students, many=True)
         return Response(serializer.data)
 
@@ -121,7 +135,20 @@ class TrainerViewSet(viewsets.ModelViewSet):
     serializer_class = TrainerSerializer
     permission_classes = [IsAdminUser]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    search_fields = ['profile__user__first_name', 'profile__user__last_name', 'specialization']
+    search_fields = ['profile__full_name', 'specialization']
+
+    def get_serializer_class(self):
+        """Return appropriate serializer based on action"""
+        if self.action in ['update', 'partial_update']:
+            return TrainerUpdateSerializer
+        return TrainerSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        return queryset
 
     @action(detail=True, methods=['get'])
     def schedule(self, request, pk=None):
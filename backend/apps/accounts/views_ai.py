@@ -1,16 +1,72 @@
 """
 Django views для AI Персонального тренера
 """
-from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404
+from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db import transaction
 from django.utils import timezone
 from datetime import datetime
 
-from apps.core.ai_fitness_agent import generate_workout_plan, generate_nutrition_plan
-from .models_ai import WorkoutPlan, NutritionPlan, FitnessGoal, FitnessLevel
+from .models_ai import (
+    WorkoutPlan, NutritionPlan, FitnessGoal, FitnessLevel,
+    FITNESS_GOAL_DISPLAY, FITNESS_LEVEL_DISPLAY,
+)
 from .models import Client
 
+# Сколько последних планов показывать в истории
+PLAN_HISTORY_SIZE = 5
+
+# Возраст для промпта, если дата рождения не указана
+DEFAULT_CLIENT_AGE = 25
+
+
+def _get_age(date_of_birth):
+    """Полных лет на сегодня (с учётом того, был ли уже день рождения)"""
+    if not date_of_birth:
+        return DEFAULT_CLIENT_AGE
+    today = timezone.localdate()
+    return today.year - date_of_birth.year - (
+        (today.month, today.day) < (date_of_birth.month, date_of_birth.day)
+    )
+
+
+def _get_client(user):
+    """
+    Клиент текущего пользователя вместе с профилем (дата рождения
+    нужна для промпта) одним запросом
+    """
+    return Client.objects.select_related('profile').get(profile__user=user)
+
+
+def _get_own_plan(model, plan_id, user):
+    """
+    План пользователя вместе с клиентом одним запросом.
+    Возвращает None, если пользователь не клиент; Http404 - если план чужой
+    или не существует
+    """
+    try:
+        return model.objects.select_related('client').get(id=plan_id, client__profile__user=user)
+    except model.DoesNotExist:
+        if not Client.objects.filter(profile__user=user).exists():
+            return None
+        raise Http404(f'No {model._meta.object_name} matches the given query.')
+
+
+def _plan_history(plans, *fields):
+    """
+    Последние PLAN_HISTORY_SIZE планов словарями с подписями для шаблона
+    """
+    history = list(plans.values('id', 'goal', 'is_active', 'created_at', *fields)[:PLAN_HISTORY_SIZE])
+    for plan in history:
+        plan['goal_display'] = FITNESS_GOAL_DISPLAY.get(plan['goal'], plan['goal'])
+        if 'fitness_level' in plan:
+            plan['fitness_level_display'] = FITNESS_LEVEL_DISPLAY.get(
+                plan['fitness_level'], plan['fitness_level']
+            )
+    return history
+
 
 @login_required
 def ai_trainer_home(request):
@@ -18,18 +74,18 @@ def ai_trainer_home(request):
     Главная страница AI тренера
     """
     try:
-        client = Client.objects.get(profile__user=request.user)
+        client = Client.objects.only('id').get(profile__user=request.user)
     except Client.DoesNotExist:
         messages.error(request, 'Только клиенты могут использовать AI тренера')
         return redirect('accounts_web:home')
 
-    # Получаем последние планы
-    latest_workout = client.workout_plans.filter(is_active=True).first()
-    latest_nutrition = client.nutrition_plans.filter(is_active=True).first()
+    # История планов - словари из .values(), без текста планов и без моделей
+    workout_history = _plan_history(client.workout_plans, 'fitness_level')
+    nutrition_history = _plan_history(client.nutrition_plans)
 
-    # Получаем историю планов
-    workout_history = client.workout_plans.all()[:5]
-    nutrition_history = client.nutrition_plans.all()[:5]
+    # Новый план деактивирует старые, поэтому активный - самый свежий из истории
+    latest_workout = next((plan for plan in workout_history if plan['is_active']), None)
+    latest_nutrition = next((plan for plan in nutrition_history if plan['is_active']), None)
 
     context = {
         'client': client,
@@ -50,7 +106,7 @@ def generate_workout(request):
     Генерация программы тренировок
     """
     try:
-        client = Client.objects.get(profile__user=request.user)
+        client = _get_client(request.user)
     except Client.DoesNotExist:
         messages.error(request, 'Только клиенты могут использовать AI тренера')
         return redirect('accounts_web:home')
@@ -61,37 +117,40 @@ def generate_workout(request):
         additional_info = request.POST.get('additional_info', '')
 
         # Получаем данные клиента
-        age = (timezone.now().date() - client.profile.date_of_birth).days // 365 if client.profile.date_of_birth else 25
+        age = _get_age(client.profile.date_of_birth)
 
         # Получаем активный абонемент (правильный related_name - 'memberships')
-        active_membership = client.memberships.filter(status='ACTIVE').first()
+        active_membership = client.memberships.filter(status='ACTIVE').select_related('membership_type').first()
         membership_type = active_membership.membership_type.name if active_membership else 'Базовый'
 
         client_data = {
             'age': age,
             'sex': 'не указан',
-            'fitness_level': dict(FitnessLevel.choices).get(fitness_level, 'Начальный'),
-            'goal': dict(FitnessGoal.choices).get(goal, 'Общая физическая подготовка'),
+            'fitness_level': FITNESS_LEVEL_DISPLAY.get(fitness_level, 'Начальный'),
+            'goal': FITNESS_GOAL_DISPLAY.get(goal, 'Общая физическая подготовка'),
             'membership_type': membership_type,
             'additional_info': additional_info,
         }
 
-        # Генерируем программу
+        # Генерируем программу (agno/Gemini импортируются только здесь:
+        # это больше секунды на старте каждого процесса)
+        from apps.core.ai_fitness_agent import generate_workout_plan
+
         try:
             workout_content = generate_workout_plan(client_data)
 
-            # Деактивируем старые планы
-            client.workout_plans.update(is_active=False)
-
-            # Создаём новый план
-            workout_plan = WorkoutPlan.objects.create(
-                client=client,
-                goal=goal,
-                fitness_level=fitness_level,
-                additional_info=additional_info,
-                workout_content=workout_content,
-                is_active=True
-            )
+            # Деактивируем старые планы и создаём новый одной транзакцией,
+            # чтобы не было момента без активного плана
+            with transaction.atomic():
+                client.workout_plans.filter(is_active=True).update(is_active=False)
+                workout_plan = WorkoutPlan.objects.create(
+                    client=client,
+                    goal=goal,
+                    fitness_level=fitness_level,
+                    additional_info=additional_info,
+                    workout_content=workout_content,
+                    is_active=True
+                )
 
             messages.success(request, 'Программа тренировок успешно сгенерирована!')
             return redirect('accounts_web:ai_trainer_home')
@@ -109,7 +168,7 @@ def generate_nutrition(request):
     Генерация плана питания
     """
     try:
-        client = Client.objects.get(profile__user=request.user)
+        client = _get_client(request.user)
     except Client.DoesNotExist:
         messages.error(request, 'Только клиенты могут использовать AI тренера')
         return redirect('accounts_web:home')
@@ -119,31 +178,33 @@ def generate_nutrition(request):
         dietary_preferences = request.POST.get('dietary_preferences', '')
 
         # Получаем данные клиента
-        age = (timezone.now().date() - client.profile.date_of_birth).days // 365 if client.profile.date_of_birth else 25
+        age = _get_age(client.profile.date_of_birth)
 
         client_data = {
             'age': age,
             'sex': 'не указан',
-            'goal': dict(FitnessGoal.choices).get(goal, 'Поддержание формы'),
+            'goal': FITNESS_GOAL_DISPLAY.get(goal, 'Поддержание формы'),
             'activity_level': 'средний',
             'dietary_preferences': dietary_preferences,
         }
 
         # Генерируем план питания
+        from apps.core.ai_fitness_agent import generate_nutrition_plan
+
         try:
             nutrition_content = generate_nutrition_plan(client_data)
 
-            # Деактивируем старые планы
-            client.nutrition_plans.update(is_active=False)
-
-            # Создаём новый план
-            nutrition_plan = NutritionPlan.objects.create(
-                client=client,
-                goal=goal,
-                dietary_preferences=dietary_preferences,
-                nutrition_content=nutrition_content,
-                is_active=True
-            )
+            # Деактивируем старые планы и создаём новый одной транзакцией,
+            # чтобы не было момента без активного плана
+            with transaction.atomic():
+                client.nutrition_plans.filter(is_active=True).update(is_active=False)
+                nutrition_plan = NutritionPlan.objects.create(
+                    client=client,
+                    goal=goal,
+                    dietary_preferences=dietary_preferences,
+                    nutrition_content=nutrition_content,
+                    is_active=True
+                )
 
             messages.success(request, 'План питания успешно сгенерирован!')
             return redirect('accounts_web:ai_trainer_home')
@@ -160,16 +221,14 @@ def view_workout_plan(request, plan_id):
     """
     Просмотр программы тренировок
     """
-    try:
-        client = Client.objects.get(profile__user=request.user)
-        workout_plan = get_object_or_404(WorkoutPlan, id=plan_id, client=client)
-    except Client.DoesNotExist:
+    workout_plan = _get_own_plan(WorkoutPlan, plan_id, request.user)
+    if workout_plan is None:
         messages.error(request, 'Доступ запрещён')
         return redirect('accounts_web:home')
 
     context = {
         'workout_plan': workout_plan,
-        'client': client,
+        'client': workout_plan.client,
     }
 
     return render(request, 'accounts/view_workout_plan.html', context)
@@ -180,16 +239,14 @@ def view_nutrition_plan(request, plan_id):
     """
     Просмотр плана питания
     """
-    try:
-        client = Client.objects.get(profile__user=request.user)
-        nutrition_plan = get_object_or_404(NutritionPlan, id=plan_id, client=client)
-    except Client.DoesNotExist:
+    nutrition_plan = _get_own_plan(NutritionPlan, plan_id, request.user)
+    if nutrition_plan is None:
         messages.error(request, 'Доступ запрещён')
         return redirect('accounts_web:home')
 
     context = {
         'nutrition_plan': nutrition_plan,
-        'client': client,
+        'client': nutrition_plan.client,
     }
 
     return render(request, 'accounts/view_nutrition_plan.html', context)
@@ -2,10 +2,23 @@
 Web views for accounts app (Django templates)
 """
 
-from django.shortcuts import render, redirect
+from datetime import date, timedelta
+
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
 from django.contrib import messages
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Prefetch, Q
+from django.utils import timezone
+
+from apps.bookings.models import Booking, BookingStatus, Visit, ACTIVE_BOOKING_STATUSES, booked_count_expr
+from apps.classes.models import Class
+from apps.memberships.models import Membership, MembershipStatus
+from .backends import invalidate_user_cache
+from .models import Profile, Client, Trainer, UserRole, normalize_phone
+from .tasks import queue_welcome_email
 
 
 def home(request):
@@ -59,25 +72,27 @@ def register_view(request):
             messages.error(request, 'Пароли не совпадают')
             return render(request, 'accounts/register.html')
 
-        # Check if username already exists
-        from django.contrib.auth.models import User
-        from .models import Profile, Client, UserRole
-
-        if User.objects.filter(username=username).exists():
-            messages.error(request, 'Пользователь с таким именем уже существует')
-            return render(request, 'accounts/register.html')
-
-        if User.objects.filter(email=email).exists():
-            messages.error(request, 'Пользователь с таким email уже существует')
-            return render(request, 'accounts/register.html')
-
-        if Profile.objects.filter(phone=phone).exists():
-            messages.error(request, 'Пользователь с таким телефоном уже существует')
+        # Check if username, email or phone already exists (one query for all three)
+        phone_e164 = normalize_phone(phone)
+        taken = Q(username=username) | Q(email=email)
+        if phone_e164:
+            taken |= Q(profile__phone_e164=phone_e164)
+        taken_users = list(
+            User.objects.filter(taken).values_list('username', 'email', 'profile__phone_e164')[:3]
+        )
+
+        error = None
+        if any(row[0] == username for row in taken_users):
+            error = 'Пользователь с таким именем уже существует'
+        elif any(row[1] == email for row in taken_users):
+            error = 'Пользователь с таким email уже существует'
+        elif taken_users:
+            error = 'Пользователь с таким телефоном уже существует'
+        if error:
+            messages.error(request, error)
             return render(request, 'accounts/register.html')
 
         try:
-            from django.db import transaction
-
             # Create user, profile and client in transaction
             with transaction.atomic():
                 # Create user
@@ -89,26 +104,38 @@ def register_view(request):
                     last_name=last_name
                 )
 
-                # Create profile
-                profile = Profile.objects.create(
+                # Create profile (Client создаётся ниже, сигнал не нужен)
+                profile = Profile(
                     user=user,
                     phone=phone,
                     role=UserRole.CLIENT,
                     avatar=avatar
                 )
+                profile._skip_signal = True
+                profile.save()
 
                 # Create client
                 Client.objects.create(profile=profile)
 
-            # Send welcome email асинхронно
-            from .tasks import send_welcome_email
-            send_welcome_email.delay(user.id)
+                # Welcome email уходит пакетом (см. dispatch_welcome_emails),
+                # в очередь - только после COMMIT, когда пользователь уже в БД
+                transaction.on_commit(lambda: queue_welcome_email(user.id))
 
             # Log the user in
             login(request, user)
-            messages.success(request, f'Добро пожаловать, {user.get_full_name() or user.username}! Ваш аккаунт успешно создан.')
+            full_name = f'{first_name} {last_name}'.strip() or username
+            messages.success(request, f'Добро пожаловать, {full_name}! Ваш аккаунт успешно создан.')
             return redirect('accounts_web:profile')
 
+        except IntegrityError:
+            # Формат телефона (CHECK) и уникальность phone_e164 проверяет БД;
+            # транзакция уже откачена, показываем ошибку формы
+            if not Profile.phone_regex.regex.match(phone):
+                messages.error(request, Profile.phone_regex.message)
+            else:
+                messages.error(request, 'Пользователь с таким телефоном уже существует')
+            return render(request, 'accounts/register.html')
+
         except Exception as e:
             messages.error(request, f'Ошибка при регистрации: {str(e)}')
             return render(request, 'accounts/register.html')
@@ -154,7 +181,6 @@ def edit_profile_view(request):
         avatar = request.POST.get('avatar', profile.avatar)
 
         # Валидация email на уникальность (если изменился)
-        from django.contrib.auth.models import User
         if email != request.user.email:
             if User.objects.filter(email=email).exclude(id=request.user.id).exists():
                 messages.error(request, 'Пользователь с таким email уже существует')
@@ -164,29 +190,37 @@ def edit_profile_view(request):
                 })
 
         try:
-            from django.db import transaction
-
             with transaction.atomic():
-                # Обновляем данные пользователя
+                # Обновляем данные пользователя: UPDATE только изменяемых колонок.
+                # queryset.update() не отправляет post_save, поэтому кеш
+                # пользователя сбрасывается явно; ФИО в профиле пишет profile.save()
                 request.user.first_name = first_name
                 request.user.last_name = last_name
                 request.user.email = email
-                request.user.save()
+                User.objects.filter(pk=request.user.pk).update(
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=email
+                )
+                invalidate_user_cache(request.user.pk)
 
                 # Обновляем профиль
                 profile.phone = phone
                 profile.address = address
                 profile.avatar = avatar
+                profile.full_name = request.user.get_full_name() or request.user.username
 
-                # Обновляем дату рождения (если указана)
-                if date_of_birth:
-                    from datetime import datetime
+                # Обновляем дату рождения (если указана, формат YYYY-MM-DD)
+                if len(date_of_birth) == 10:
                     try:
-                        profile.date_of_birth = datetime.strptime(date_of_birth, '%Y-%m-%d').date()
+                        profile.date_of_birth = date.fromisoformat(date_of_birth)
                     except ValueError:
                         pass  # Игнорируем неправильный формат
 
-                profile.save()
+                # phone_e164 добавляет Profile.save()
+                profile.save(update_fields=[
+                    'phone', 'address', 'avatar', 'date_of_birth', 'full_name', 'updated_at'
+                ])
 
             messages.success(request, 'Профиль успешно обновлён!')
             return redirect('accounts_web:profile')
@@ -204,13 +238,16 @@ def trainers_list(request):
     """
     Страница со списком тренеров
     """
-    from .models import Trainer
-
     # Получаем всех активных тренеров
     trainers = Trainer.objects.filter(
         is_active=True
     ).select_related(
         'profile__user'
+    ).only(
+        'specialization', 'experience_years', 'bio', 'certifications',
+        'profile__avatar', 'profile__phone',
+        'profile__user__username', 'profile__user__first_name',
+        'profile__user__last_name', 'profile__user__email'
     ).order_by('-experience_years')
 
     return render(request, 'accounts/trainers_list.html', {
@@ -226,13 +263,6 @@ def trainer_dashboard(request):
     - Список клиентов на занятиях
     - Отметка посещений
     """
-    from .models import Trainer, UserRole
-    from apps.classes.models import Class
-    from apps.bookings.models import Booking, BookingStatus
-    from django.db.models import Count, Q
-    from django.utils import timezone
-    from datetime import timedelta
-
     # Проверяем, что пользователь - тренер
     if not hasattr(request.user, 'profile') or request.user.profile.role != UserRole.TRAINER:
         messages.error(request, 'Доступ запрещён. Эта страница только для тренеров.')
@@ -255,9 +285,25 @@ def trainer_dashboard(request):
     ).select_related(
         'class_type',
         'room'
-    ).annotate(
-        booked_count=Count('bookings', filter=Q(bookings__status__in=[BookingStatus.CONFIRMED, BookingStatus.COMPLETED]))
+    ).only(
+        'datetime', 'max_capacity', 'class_type__name', 'room__name'
+    ).prefetch_related(
+        Prefetch(
+            'bookings',
+            queryset=Booking.objects.filter(
+                status__in=ACTIVE_BOOKING_STATUSES
+            ).select_related('client__profile__user').only(
+                'class_instance', 'status', 'client__profile__phone',
+                'client__profile__user__first_name', 'client__profile__user__last_name'
+            ).order_by('booking_date'),
+            to_attr='confirmed_bookings'
+        )
     ).order_by('datetime')
+    # Вычисляем один раз: шаблон, счётчик и ближайшее занятие берутся из списка
+    upcoming_classes = list(upcoming_classes)
+    # Число записей берётся из уже загруженных бронирований (без COUNT + GROUP BY)
+    for upcoming_class in upcoming_classes:
+        upcoming_class.booked_count = len(upcoming_class.confirmed_bookings)
 
     # Прошедшие занятия (последние 7 дней)
     past_classes = Class.objects.filter(
@@ -268,30 +314,27 @@ def trainer_dashboard(request):
         'class_type',
         'room'
     ).annotate(
-        booked_count=Count('bookings', filter=Q(bookings__status__in=[BookingStatus.CONFIRMED, BookingStatus.COMPLETED]))
+        booked_count=booked_count_expr()
     ).order_by('-datetime')[:10]
 
     # Статистика
     total_classes = Class.objects.filter(trainer=trainer).count()
-    upcoming_count = upcoming_classes.count()
+    upcoming_count = len(upcoming_classes)
 
     # Клиенты на ближайшем занятии
-    next_class = upcoming_classes.first()
-    next_class_clients = None
-    if next_class:
-        next_class_clients = Booking.objects.filter(
-            class_instance=next_class,
-            status__in=[BookingStatus.CONFIRMED, BookingStatus.COMPLETED]
-        ).select_related(
-            'client__profile__user'
-        ).order_by('booking_date')
+    next_class = upcoming_classes[0] if upcoming_classes else None
+    next_class_clients = next_class.confirmed_bookings if next_class else None
 
     # Уникальные клиенты тренера (за последние 30 дней)
-    unique_clients = Booking.objects.filter(
-        class_instance__trainer=trainer,
-        class_instance__datetime__gte=now - timedelta(days=30),
-        status__in=[BookingStatus.CONFIRMED, BookingStatus.COMPLETED]
-    ).values('client').distinct().count()
+    # (EXISTS по каждому клиенту вместо DISTINCT по всем строкам бронирований)
+    unique_clients = Client.objects.filter(
+        Exists(Booking.objects.filter(
+            client=OuterRef('pk'),
+            class_instance__trainer=trainer,
+            class_instance__datetime__gte=now - timedelta(days=30),
+            status__in=ACTIVE_BOOKING_STATUSES
+        ))
+    ).count()
 
     context = {
         'trainer': trainer,
@@ -312,11 +355,6 @@ def trainer_class_detail(request, class_id):
     """
     Детали занятия для тренера с возможностью отметки посещений
     """
-    from .models import Trainer, UserRole
-    from apps.classes.models import Class
-    from apps.bookings.models import Booking, BookingStatus, Visit
-    from django.shortcuts import get_object_or_404
-
     # Проверяем, что пользователь - тренер
     if not hasattr(request.user, 'profile') or request.user.profile.role != UserRole.TRAINER:
         messages.error(request, 'Доступ запрещён')
@@ -338,33 +376,47 @@ def trainer_class_detail(request, class_id):
 
         if booking_id and action:
             try:
-                booking = Booking.objects.get(id=booking_id, class_instance=class_instance)
-
-                if action == 'mark_completed':
-                    # Отмечаем посещение
-                    booking.status = BookingStatus.COMPLETED
-                    booking.save()
-
-                    # Создаём запись о посещении, если её нет
-                    Visit.objects.get_or_create(
-                        booking=booking,
-                        defaults={'checked_by': request.user}
-                    )
-
-                    # Уменьшаем счётчик посещений в абонементе
-                    if booking.client.memberships.filter(status='ACTIVE').exists():
-                        active_membership = booking.client.memberships.filter(status='ACTIVE').first()
-                        if active_membership.visits_remaining is not None and active_membership.visits_remaining > 0:
-                            active_membership.visits_remaining -= 1
-                            active_membership.save()
-
-                    messages.success(request, f'Посещение отмечено для {booking.client.profile.user.get_full_name()}')
-
-                elif action == 'mark_no_show':
-                    # Отмечаем неявку
-                    booking.status = BookingStatus.NO_SHOW
-                    booking.save()
-                    messages.warning(request, f'Отмечена неявка для {booking.client.profile.user.get_full_name()}')
+                # Бронирование блокируется до конца транзакции: одновременные
+                # отметки с разных устройств выполняются по очереди
+                with transaction.atomic():
+                    booking = Booking.objects.select_for_update(of=('self',)).select_related(
+                        'client__profile'
+                    ).get(id=booking_id, class_instance=class_instance)
+                    client_name = booking.client.profile.full_name
+
+                    if action == 'mark_completed':
+                        # Отмечаем посещение
+                        booking.status = BookingStatus.COMPLETED
+                        booking.save(update_fields=['status'])
+
+                        # Создаём запись о посещении, если её нет
+                        _, visit_created = Visit.objects.get_or_create(
+                            booking=booking,
+                            defaults={'checked_by': request.user}
+                        )
+
+                        # Уменьшаем счётчик посещений в абонементе
+                        # (только при первой отметке посещения)
+                        if visit_created:
+                            active_id = booking.client.memberships.filter(
+                                status=MembershipStatus.ACTIVE
+                            ).values_list('pk', flat=True).first()
+                            if active_id:
+                                # Условие в самом UPDATE: счётчик не уйдёт ниже нуля
+                                # при одновременной отметке
+                                Membership.objects.filter(
+                                    pk=active_id,
+                                    status=MembershipStatus.ACTIVE,
+                                    visits_remaining__gt=0
+                                ).update(visits_remaining=F('visits_remaining') - 1)
+
+                        messages.success(request, f'Посещение отмечено для {client_name}')
+
+                    elif action == 'mark_no_show':
+                        # Отмечаем неявку
+                        booking.status = BookingStatus.NO_SHOW
+                        booking.save(update_fields=['status'])
+                        messages.warning(request, f'Отмечена неявка для {client_name}')
 
             except Booking.DoesNotExist:
                 messages.error(request, 'Бронирование не найдено')
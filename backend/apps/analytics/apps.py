@@ -5,3 +5,7 @@ class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.analytics'
     verbose_name = 'Аналитика и отчёты'
+
+    def ready(self):
+        """Импортируем signals при запуске приложения"""
+        import apps.analytics.signals
@@ -0,0 +1,29 @@
+"""
+Signals для сброса кеша dashboard
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.accounts.models import Client
+from apps.bookings.models import Booking
+from apps.bookings.signals import bookings_bulk_updated
+from apps.payments.models import Payment
+from core.patterns.singleton import cache_manager
+from .views import DASHBOARD_CACHE_KEY
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_save, sender=Booking)
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Payment)
+@receiver(post_delete, sender=Booking)
+@receiver(post_delete, sender=Client)
+@receiver(bookings_bulk_updated, sender=Booking)
+def invalidate_dashboard_cache(sender, **kwargs):
+    """
+    Сбрасывает кеш dashboard после фиксации транзакции, чтобы
+    параллельный запрос не закешировал данные до коммита
+    """
+    transaction.on_commit(lambda: cache_manager.delete(DASHBOARD_CACHE_KEY))
@@ -0,0 +1,118 @@
+"""
+Тесты для dashboard аналитики и его кеша
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.analytics.views import DASHBOARD_CACHE_KEY
+from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.tasks import cleanup_old_bookings
+from core.patterns.singleton import cache_manager
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Каждый тест начинается с пустого кеша"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def staff_client(plain_client, test_admin_user):
+    """Django test Client с авторизованным сотрудником"""
+    plain_client.force_login(test_admin_user)
+    return plain_client
+
+
+def _is_primitive(value):
+    """Значение без экземпляров моделей (только встроенные типы)"""
+    if isinstance(value, dict):
+        return all(_is_primitive(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return all(_is_primitive(item) for item in value)
+    return value is None or isinstance(value, (str, int, float, Decimal, date, datetime))
+
+
+@pytest.mark.integration
+class TestDashboardCache:
+    """Тесты кеширования контекста dashboard"""
+
+    def test_dashboard_renders_upcoming_class(self, staff_client, test_booking):
+        """Dashboard показывает предстоящие занятия и загрузку тренеров"""
+        response = staff_client.get(reverse('analytics:dashboard'))
+
+        assert response.status_code == 200
+        upcoming = response.context['upcoming_classes']
+        assert upcoming[0]['class_type__name'] == test_booking.class_instance.class_type.name
+        assert upcoming[0]['current_capacity'] == 1
+        assert response.context['trainer_load'][0]['classes_count'] == 1
+
+    def test_cached_context_is_primitive(self, staff_client, test_booking):
+        """В кеше только примитивы, без экземпляров моделей"""
+        staff_client.get(reverse('analytics:dashboard'))
+
+        cached = cache_manager.get(DASHBOARD_CACHE_KEY)
+        assert cached is not None
+        assert _is_primitive(cached)
+
+    def test_second_request_uses_cache(self, staff_client, test_booking, django_assert_max_num_queries):
+        """Повторный запрос не пересчитывает статистику"""
+        url = reverse('analytics:dashboard')
+        staff_client.get(url)
+
+        # Остаются только запросы сессии и пользователя
+        with django_assert_max_num_queries(2):
+            response = staff_client.get(url)
+        assert response.status_code == 200
+
+    def test_query_count_is_constant(self, staff_client, test_booking, create_client):
+        """Число запросов при построении контекста не зависит от числа занятий и тренеров"""
+        url = reverse('analytics:dashboard')
+        staff_client.get(url)
+        cache_manager.delete(DASHBOARD_CACHE_KEY)
+
+        with CaptureQueriesContext(connection) as small:
+            staff_client.get(url)
+
+        for _ in range(3):
+            Booking.objects.create(
+                client=create_client(),
+                class_instance=test_booking.class_instance,
+                status=BookingStatus.CONFIRMED
+            )
+        cache_manager.delete(DASHBOARD_CACHE_KEY)
+
+        with CaptureQueriesContext(connection) as large:
+            staff_client.get(url)
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+    def test_booking_save_invalidates(self, staff_client, test_booking, django_capture_on_commit_callbacks):
+        """Сохранение бронирования сбрасывает кеш"""
+        staff_client.get(reverse('analytics:dashboard'))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            test_booking.status = BookingStatus.CANCELLED
+            test_booking.save()
+
+        assert cache_manager.get(DASHBOARD_CACHE_KEY) is None
+
+    def test_bulk_update_invalidates(self, staff_client, test_booking, django_capture_on_commit_callbacks):
+        """Массовый UPDATE в задачах bookings сбрасывает кеш через bookings_bulk_updated"""
+        test_class = test_booking.class_instance
+        test_class.datetime = datetime(2020, 1, 1)
+        test_class.save()
+        staff_client.get(reverse('analytics:dashboard'))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            cleanup_old_bookings()
+
+        assert cache_manager.get(DASHBOARD_CACHE_KEY) is None
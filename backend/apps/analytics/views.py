@@ -4,7 +4,7 @@ Views для аналитики и dashboard
 
 from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db.models import Count, Sum, Avg
+from django.db.models import Count, Sum, Avg, Value
 from django.db.models.functions import TruncDate
 from django.utils import timezone
 from datetime import timedelta, date
@@ -12,9 +12,18 @@ import json
 
 from apps.accounts.models import Client, Trainer
 from apps.memberships.models import Membership, MembershipStatus
-from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.models import Booking, BookingStatus, booked_count_expr
 from apps.payments.models import Payment, PaymentStatus
-from apps.classes.models import Class
+from apps.classes.models import Class, ClassType
+from core.patterns.singleton import cache_manager
+
+# Контекст dashboard одинаков для всех сотрудников: кешируется на минуту,
+# сбрасывается сигналами при изменении платежей, бронирований и клиентов
+DASHBOARD_CACHE_KEY = 'analytics:dashboard'
+DASHBOARD_CACHE_TIMEOUT = 60
+
+# Данные графиков встраиваются в страницу: JSON без пробелов
+CHART_JSON_SEPARATORS = (',', ':')
 
 
 @staff_member_required
@@ -22,15 +31,33 @@ def dashboard(request):
     """
     Dashboard для администратора с основной статистикой
     """
+    context = cache_manager.get(DASHBOARD_CACHE_KEY)
+    if context is None:
+        context = _build_dashboard_context()
+        cache_manager.set(DASHBOARD_CACHE_KEY, context, DASHBOARD_CACHE_TIMEOUT)
+
+    return render(request, 'analytics/dashboard.html', context)
+
+
+def _full_name(first_name, last_name):
+    """ФИО как User.get_full_name() без загрузки модели"""
+    return f'{first_name} {last_name}'.strip()
 
+
+def _build_dashboard_context():
+    """
+    Собирает статистику для dashboard. В контексте только числа, строки,
+    даты и списки словарей - в кеш не попадают экземпляры моделей
+    """
     # Общая статистика
     total_clients = Client.objects.count()
     total_trainers = Trainer.objects.filter(is_active=True).count()
     active_memberships = Membership.objects.filter(status=MembershipStatus.ACTIVE).count()
     total_classes = Class.objects.count()
 
-    # Статистика за последние 30 дней
-    last_30_days = timezone.now() - timedelta(days=30)
+    # Статистика за последние 30 дней (одно "сейчас" на весь dashboard)
+    now = timezone.now()
+    last_30_days = now - timedelta(days=30)
 
     new_clients_30d = Client.objects.filter(
         profile__created_at__gte=last_30_days
@@ -53,8 +80,6 @@ def dashboard(request):
     ).aggregate(total=Sum('amount'))['total'] or 0
 
     # Топ-5 популярных типов занятий (по типам, не по конкретным занятиям)
-    from django.db.models import Q
-    from apps.classes.models import ClassType
 
     popular_classes = ClassType.objects.annotate(
         bookings_count=Count('class__bookings')
@@ -66,96 +91,99 @@ def dashboard(request):
         for ct in popular_classes
     ]
 
-    # Статистика по статусам бронирований
+    # Статистика по статусам бронирований (один GROUP BY вместо шести COUNT)
+    bookings_by_status = dict(
+        Booking.objects.values_list('status').annotate(count=Count('id'))
+    )
     booking_stats = {
-        'confirmed': Booking.objects.filter(status=BookingStatus.CONFIRMED).count(),
-        'completed': Booking.objects.filter(status=BookingStatus.COMPLETED).count(),
-        'cancelled': Booking.objects.filter(status=BookingStatus.CANCELLED).count(),
-        'no_show': Booking.objects.filter(status=BookingStatus.NO_SHOW).count(),
+        'confirmed': bookings_by_status.get(BookingStatus.CONFIRMED, 0),
+        'completed': bookings_by_status.get(BookingStatus.COMPLETED, 0),
+        'cancelled': bookings_by_status.get(BookingStatus.CANCELLED, 0),
+        'no_show': bookings_by_status.get(BookingStatus.NO_SHOW, 0),
     }
 
     # Процент посещаемости
-    total_bookings = Booking.objects.count()
-    completed_bookings = Booking.objects.filter(status=BookingStatus.COMPLETED).count()
+    total_bookings = sum(bookings_by_status.values())
+    completed_bookings = booking_stats['completed']
     attendance_rate = (completed_bookings / total_bookings * 100) if total_bookings > 0 else 0
 
     # Загрузка тренеров (количество занятий)
-    trainer_load = Trainer.objects.filter(
-        is_active=True
-    ).annotate(
-        classes_count=Count('classes')
-    ).order_by('-classes_count')[:5]
-
-    # Последние платежи
-    recent_payments = Payment.objects.select_related(
-        'client__profile__user',
-        'membership__membership_type'
-    ).order_by('-created_at')[:10]
+    trainer_load = [
+        {'name': _full_name(first_name, last_name), 'classes_count': classes_count}
+        for first_name, last_name, classes_count in Trainer.objects.filter(
+            is_active=True
+        ).annotate(
+            classes_count=Count('classes')
+        ).order_by('-classes_count').values_list(
+            'profile__user__first_name', 'profile__user__last_name', 'classes_count'
+        )[:5]
+    ]
 
     # Предстоящие занятия
-    upcoming_classes = Class.objects.filter(
-        datetime__gte=timezone.now()
-    ).select_related(
-        'class_type',
-        'trainer__profile__user',
-        'room'
-    ).annotate(
-        current_capacity=Count('bookings', filter=Q(bookings__status__in=[BookingStatus.CONFIRMED, BookingStatus.COMPLETED]))
-    ).order_by('datetime')[:5]
+    upcoming_classes = [
+        {
+            'class_type__name': row['class_type__name'],
+            'datetime': row['datetime'],
+            'trainer_name': _full_name(
+                row['trainer__profile__user__first_name'],
+                row['trainer__profile__user__last_name']
+            ),
+            'room__name': row['room__name'],
+            'current_capacity': row['current_capacity'],
+            'max_capacity': row['max_capacity'],
+        }
+        for row in Class.objects.filter(
+            datetime__gte=now
+        ).order_by('datetime').values(
+            'datetime', 'max_capacity', 'class_type__name', 'room__name',
+            'trainer__profile__user__first_name', 'trainer__profile__user__last_name',
+            current_capacity=booked_count_expr()
+        )[:5]
+    ]
+
+    # Данные для графиков по дням (последние 30 дней): три ряда одним запросом.
+    # Даты берутся в локальной зоне - в ней же считает TruncDate
+    today = timezone.localdate(now)
+    chart_days = [today - timedelta(days=29 - i) for i in range(30)]
 
-    # Данные для графика выручки по дням (последние 30 дней)
     revenue_by_day = Payment.objects.filter(
         status=PaymentStatus.COMPLETED,
         completed_at__gte=last_30_days
     ).annotate(
         day=TruncDate('completed_at')
     ).values('day').annotate(
-        total=Sum('amount')
-    ).order_by('day')
-
-    # Заполняем все дни (даже если нет данных)
-    revenue_chart_labels = []
-    revenue_chart_data = []
-    revenue_dict = {item['day']: float(item['total']) for item in revenue_by_day}
-
-    for i in range(30):
-        day = (timezone.now() - timedelta(days=29-i)).date()
-        revenue_chart_labels.append(day.strftime('%d.%m'))
-        revenue_chart_data.append(revenue_dict.get(day, 0))
+        value=Sum('amount'), series=Value('revenue')
+    ).values_list('series', 'day', 'value').order_by()
 
-    # Данные для графика новых клиентов по дням
     clients_by_day = Client.objects.filter(
         profile__created_at__gte=last_30_days
     ).annotate(
         day=TruncDate('profile__created_at')
     ).values('day').annotate(
-        count=Count('id')
-    ).order_by('day')
+        value=Count('id'), series=Value('clients')
+    ).values_list('series', 'day', 'value').order_by()
 
-    clients_chart_data = []
-    clients_dict = {item['day']: item['count'] for item in clients_by_day}
-
-    for i in range(30):
-        day = (timezone.now() - timedelta(days=29-i)).date()
-        clients_chart_data.append(clients_dict.get(day, 0))
-
-    # Данные для графика бронирований по дням
     bookings_by_day = Booking.objects.filter(
         booking_date__gte=last_30_days
     ).annotate(
         day=TruncDate('booking_date')
     ).values('day').annotate(
-        count=Count('id')
-    ).order_by('day')
+        value=Count('id'), series=Value('bookings')
+    ).values_list('series', 'day', 'value').order_by()
 
-    bookings_chart_data = []
-    bookings_dict = {item['day']: item['count'] for item in bookings_by_day}
+    # Тип колонки value в объединении задаёт первый запрос (Decimal),
+    # поэтому количества приводятся к int обратно
+    chart_values = {'revenue': {}, 'clients': {}, 'bookings': {}}
+    for series, day, value in revenue_by_day.union(clients_by_day, bookings_by_day, all=True):
+        chart_values[series][day] = float(value) if series == 'revenue' else int(value)
 
-    for i in range(30):
-        day = (timezone.now() - timedelta(days=29-i)).date()
-        bookings_chart_data.append(bookings_dict.get(day, 0))
+    # Заполняем все дни (даже если нет данных)
+    revenue_chart_labels = [day.strftime('%d.%m') for day in chart_days]
+    revenue_chart_data = [chart_values['revenue'].get(day, 0) for day in chart_days]
+    clients_chart_data = [chart_values['clients'].get(day, 0) for day in chart_days]
+    bookings_chart_data = [chart_values['bookings'].get(day, 0) for day in chart_days]
 
-    context = {
+    return {
         # Основные метрики
         'total_clients': total_clients,
         'total_trainers': total_trainers,
@@ -177,14 +205,11 @@ def dashboard(request):
         'trainer_load': trainer_load,
 
         # Последние данные
-        'recent_payments': recent_payments,
         'upcoming_classes': upcoming_classes,
 
         # Данные для графиков (преобразуем в JSON для JavaScript)
-        'revenue_chart_labels': json.dumps(revenue_chart_labels),
-        'revenue_chart_data': json.dumps(revenue_chart_data),
-        'clients_chart_data': json.dumps(clients_chart_data),
-        'bookings_chart_data': json.dumps(bookings_chart_data),
+        'revenue_chart_labels': json.dumps(revenue_chart_labels, separators=CHART_JSON_SEPARATORS),
+        'revenue_chart_data': json.dumps(revenue_chart_data, separators=CHART_JSON_SEPARATORS),
+        'clients_chart_data': json.dumps(clients_chart_data, separators=CHART_JSON_SEPARATORS),
+        'bookings_chart_data': json.dumps(bookings_chart_data, separators=CHART_JSON_SEPARATORS),
     }
-
-    return render(request, 'analytics/dashboard.html', context)
@@ -5,6 +5,7 @@ from .models import Booking, Visit
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
     list_display = ('client', 'class_instance', 'booking_date', 'status')
+    list_select_related = ('client__profile', 'class_instance__class_type')
     list_filter = ('status', 'booking_date')
     search_fields = ('client__profile__user__username',)
     date_hierarchy = 'booking_date'
@@ -13,5 +14,8 @@ class BookingAdmin(admin.ModelAdmin):
 @admin.register(Visit)
 class VisitAdmin(admin.ModelAdmin):
     list_display = ('booking', 'checked_in_at', 'checked_by')
+    list_select_related = (
+        'booking__client__profile', 'booking__class_instance__class_type', 'checked_by'
+    )
     search_fields = ('booking__client__profile__user__username',)
     date_hierarchy = 'checked_in_at'
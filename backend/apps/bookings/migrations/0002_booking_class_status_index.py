@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bookings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["class_instance", "status"], name="bk_class_status_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bookings", "0002_booking_class_status_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(("status", "CONFIRMED")),
+                fields=["class_instance"],
+                name="bk_confirmed_cls_idx",
+            ),
+        ),
+    ]
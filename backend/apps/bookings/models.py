@@ -3,6 +3,8 @@ Models for bookings app: Booking, Visit
 """
 
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import timedelta
@@ -17,6 +19,32 @@ class BookingStatus(models.TextChoices):
     NO_SHOW = 'NO_SHOW', 'Не пришел'
 
 
+# Отмена возможна не позднее чем за это время до начала занятия
+CANCEL_DEADLINE = timedelta(hours=24)
+
+
+class BookingQuerySet(models.QuerySet):
+    """QuerySet бронирований"""
+
+    def with_can_cancel(self, now=None):
+        """
+        Добавляет can_cancel_annot - то же правило, что Booking.can_cancel,
+        но вычисленное в SQL одним выражением для всех строк
+        """
+        now = now or timezone.now()
+        return self.annotate(
+            can_cancel_annot=models.Case(
+                models.When(
+                    status=BookingStatus.CONFIRMED,
+                    class_instance__datetime__gt=now + CANCEL_DEADLINE,
+                    then=models.Value(True)
+                ),
+                default=models.Value(False),
+                output_field=models.BooleanField()
+            )
+        )
+
+
 class Booking(models.Model):
     """
     Client's booking for a class
@@ -33,11 +61,23 @@ class Booking(models.Model):
     cancelled_at = models.DateTimeField(null=True, blank=True, verbose_name='Дата отмены')
     notes = models.TextField(blank=True, verbose_name='Заметки')
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Бронирование'
         verbose_name_plural = 'Бронирования'
         ordering = ['-booking_date']
         unique_together = ('client', 'class_instance')
+        indexes = [
+            # Активные бронирования занятия (booked_count_expr)
+            models.Index(fields=['class_instance', 'status'], name='bk_class_status_idx'),
+            # Подтверждённые бронирования по занятиям (Celery задачи)
+            models.Index(
+                fields=['class_instance'],
+                condition=models.Q(status=BookingStatus.CONFIRMED),
+                name='bk_confirmed_cls_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.client} - {self.class_instance} ({self.get_status_display()})"
@@ -56,17 +96,18 @@ class Booking(models.Model):
         # Проверяем активный абонемент на дату занятия
         from apps.memberships.models import MembershipStatus
 
+        class_date = self.class_instance.datetime.date()
         active_membership = self.client.memberships.filter(
             status=MembershipStatus.ACTIVE,
-            start_date__lte=self.class_instance.datetime.date(),
-            end_date__gte=self.class_instance.datetime.date()
+            start_date__lte=class_date,
+            end_date__gte=class_date
         ).first()
 
         if not active_membership:
             raise ValidationError({
                 'class_instance': f'У клиента {self.client} нет активного абонемента на дату занятия '
-                                f'{self.class_instance.datetime.date()}. '
-                                f'Абонемент должен быть активен с {self.class_instance.datetime.date()}.'
+                                f'{class_date}. '
+                                f'Абонемент должен быть активен с {class_date}.'
             })
 
         # Проверяем остаток посещений
@@ -81,11 +122,43 @@ class Booking(models.Model):
         """
         Проверяет, можно ли отменить бронирование
         Правила: статус CONFIRMED и до занятия >= 24 часов
+        (берётся из аннотации BookingQuerySet.with_can_cancel, если она есть)
         """
+        if hasattr(self, 'can_cancel_annot'):
+            return self.can_cancel_annot
+        return self.can_cancel_at(timezone.now())
+
+    def can_cancel_at(self, now):
+        """Правило can_cancel относительно заданного момента времени"""
         if self.status != BookingStatus.CONFIRMED:
             return False
-        time_until_class = self.class_instance.datetime - timezone.now()
-        return time_until_class > timedelta(hours=24)
+        return self.class_instance.datetime - now > CANCEL_DEADLINE
+
+
+# Бронирования, занимающие место на занятии
+ACTIVE_BOOKING_STATUSES = [BookingStatus.CONFIRMED, BookingStatus.COMPLETED]
+
+
+def booked_count_expr():
+    """
+    Число активных бронирований занятия для .annotate() на querysets Class
+
+    Коррелированный подзапрос вместо Count('bookings', filter=...), который
+    добавляет JOIN и GROUP BY по всем строкам Class. Выражение строится при
+    вызове: queryset на уровне модуля обращается к реестру моделей до его загрузки
+    """
+    return Coalesce(
+        Subquery(
+            Booking.objects.filter(
+                class_instance=OuterRef('pk'),
+                status__in=ACTIVE_BOOKING_STATUSES
+            ).order_by().values('class_instance').annotate(
+                count=Count('*')
+            ).values('count'),
+            output_field=models.IntegerField()
+        ),
+        0
+    )
 
 
 class Visit(models.Model):
@@ -4,12 +4,30 @@
 
 from rest_framework import serializers
 from django.utils import timezone
-from datetime import timedelta
 from .models import Booking, Visit, BookingStatus
 from apps.classes.models import Class
 from apps.accounts.models import Client
 
 
+class CanCancelField(serializers.BooleanField):
+    """
+    Booking.can_cancel: аннотация with_can_cancel(), а для строк без неё -
+    проверка с одним timezone.now() на весь ответ (context['_now'])
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if hasattr(instance, 'can_cancel_annot'):
+            return instance.can_cancel_annot
+        now = self.context.get('_now')
+        if now is None:
+            now = self.context['_now'] = timezone.now()
+        return instance.can_cancel_at(now)
+
+
 class BookingSerializer(serializers.ModelSerializer):
     """
     Сериализатор для Booking с логикой валидации
@@ -20,7 +38,7 @@ class BookingSerializer(serializers.ModelSerializer):
     room_name = serializers.CharField(source='class_instance.room.name', read_only=True)
     class_datetime = serializers.DateTimeField(source='class_instance.datetime', read_only=True)
     client_name = serializers.CharField(source='client.profile.user.get_full_name', read_only=True)
-    can_cancel = serializers.SerializerMethodField()
+    can_cancel = CanCancelField()
 
     class Meta:
         model = Booking
@@ -31,13 +49,6 @@ class BookingSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['booking_date', 'cancelled_at']
 
-    def get_can_cancel(self, obj):
-        """Проверяет, можно ли отменить бронирование (за 24 часа до занятия)"""
-        if obj.status != BookingStatus.CONFIRMED:
-            return False
-        time_until_class = obj.class_instance.datetime - timezone.now()
-        return time_until_class > timedelta(hours=24)
-
     def validate_class_instance(self, value):
         """
         Проверяет наличие свободных мест на занятии
@@ -62,10 +73,11 @@ class BookingSerializer(serializers.ModelSerializer):
         class_instance = attrs.get('class_instance') or self.instance.class_instance
 
         # Получаем активный абонемент клиента на дату занятия
+        class_date = class_instance.datetime.date()
         active_membership = client.memberships.filter(
             status='ACTIVE',
-            start_date__lte=class_instance.datetime.date(),
-            end_date__gte=class_instance.datetime.date()
+            start_date__lte=class_date,
+            end_date__gte=class_date
         ).first()
 
         if not active_membership:
@@ -0,0 +1,9 @@
+"""
+Signals приложения bookings
+"""
+
+from django.dispatch import Signal
+
+# Отправляется после массового UPDATE бронирований (queryset.update()
+# не отправляет post_save). Подписчики: сброс кеша dashboard в analytics
+bookings_bulk_updated = Signal()
@@ -2,14 +2,26 @@
 Celery задачи для системы бронирований
 """
 
+from collections import Counter, defaultdict
+
 from celery import shared_task
 from django.utils import timezone
 from datetime import timedelta
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef, Value
+from django.db.models.functions import Concat
 
-from .models import Booking, BookingStatus
+from .models import Booking, BookingStatus, Visit
+from .signals import bookings_bulk_updated
+from apps.memberships.models import Membership, MembershipStatus
 from core.patterns.observer import BookingSubject
 
+# Размер пачки подтверждений бронирований в одной задаче
+BOOKING_CONFIRMATION_CHUNK_SIZE = 200
+
+# Пометка, добавляемая к заметкам авто-отменённого бронирования
+AUTO_CANCEL_NOTE = "\n[Авто-отмена: не подтверждено за 30 мин до начала]"
+
 
 @shared_task
 def send_booking_reminders():
@@ -31,41 +43,39 @@ def send_booking_reminders():
     time_end = now + timedelta(hours=2, minutes=30)
 
     # Находим бронирования в этом временном окне
-    bookings = Booking.objects.select_related(
-        'client__profile__user',
-        'class_instance__class_type',
-        'class_instance__room'
-    ).filter(
+    # (только нужные колонки кортежами, без создания моделей)
+    bookings = Booking.objects.filter(
         status=BookingStatus.CONFIRMED,
         class_instance__datetime__gte=time_start,
         class_instance__datetime__lt=time_end
+    ).values_list(
+        'id',
+        'client__profile__user__email',
+        'client__profile__phone',
+        'class_instance__class_type__name',
+        'class_instance__datetime'
     )
 
     # Используем Observer pattern для отправки уведомлений
     booking_subject = BookingSubject()
 
     sent_count = 0
-    for booking in bookings:
+    # Строки читаются серверным курсором пачками, без кеша всего queryset
+    for booking_id, user_email, phone, class_name, class_datetime in bookings.iterator(chunk_size=500):
         try:
-            # Получаем email и телефон клиента
-            user_email = booking.client.profile.user.email
-            phone = booking.client.profile.phone
-            class_name = booking.class_instance.class_type.name
-            class_datetime = booking.class_instance.datetime.strftime('%d.%m.%Y %H:%M')
-
             # Отправляем напоминание через Observer (email + SMS)
             booking_subject.booking_reminder(
                 user_email=user_email,
                 phone=phone,
                 class_name=class_name,
-                class_datetime=class_datetime
+                class_datetime=class_datetime.strftime('%d.%m.%Y %H:%M')
             )
 
             sent_count += 1
 
         except Exception as e:
             # Логируем ошибку, но продолжаем обработку остальных
-            print(f"Ошибка при отправке напоминания для бронирования {booking.id}: {e}")
+            print(f"Ошибка при отправке напоминания для бронирования {booking_id}: {e}")
 
     return f"Отправлено {sent_count} напоминаний"
 
@@ -89,39 +99,64 @@ def cancel_unconfirmed_bookings():
 
     # Находим подтверждённые бронирования, которые скоро начнутся
     # и у которых нет отметки посещения
-    bookings_to_cancel = Booking.objects.select_related(
-        'class_instance',
-        'client__profile__user'
-    ).filter(
+    # (anti-join через NOT EXISTS вместо LEFT JOIN на visit)
+    bookings_to_cancel = Booking.objects.filter(
+        ~Exists(Visit.objects.filter(booking=OuterRef('pk'))),
         status=BookingStatus.CONFIRMED,
         class_instance__datetime__lte=cutoff_time,
         class_instance__datetime__gt=now
-    ).exclude(
-        visit__isnull=False  # Исключаем те, где уже есть отметка посещения
     )
 
-    cancelled_count = 0
-
     with transaction.atomic():
-        for booking in bookings_to_cancel:
-            # Отменяем бронирование
-            booking.status = BookingStatus.NO_SHOW
-            booking.cancelled_at = now
-            booking.notes += "\n[Авто-отмена: не подтверждено за 30 мин до начала]"
-            booking.save()
-
-            # Возвращаем посещение в абонемент (если лимитированный)
-            active_membership = booking.client.memberships.filter(
-                status='ACTIVE',
-                start_date__lte=booking.class_instance.datetime.date(),
-                end_date__gte=booking.class_instance.datetime.date()
-            ).first()
-
-            if active_membership and active_membership.visits_remaining is not None:
-                active_membership.visits_remaining += 1
-                active_membership.save()
-
-            cancelled_count += 1
+        rows = list(bookings_to_cancel.select_for_update(of=('self',)).values_list(
+            'id', 'client_id', 'class_instance__datetime'
+        ))
+        if not rows:
+            return "Автоматически отменено 0 бронирований"
+
+        # Отменяем бронирования одним UPDATE
+        cancelled_count = Booking.objects.filter(id__in=[row[0] for row in rows]).update(
+            status=BookingStatus.NO_SHOW,
+            cancelled_at=now,
+            notes=Concat(
+                'notes', Value(AUTO_CANCEL_NOTE), output_field=models.TextField()
+            )
+        )
+
+        # Возвращаем посещения в абонементы (если лимитированные): для каждого
+        # бронирования берётся первый активный абонемент на дату занятия, как
+        # client.memberships.filter(...).first()
+        class_dates = [row[2].date() for row in rows]
+        memberships_by_client = defaultdict(list)
+        for membership in Membership.objects.filter(
+            status=MembershipStatus.ACTIVE,
+            client_id__in={row[1] for row in rows},
+            start_date__lte=max(class_dates),
+            end_date__gte=min(class_dates)
+        ).only('client_id', 'start_date', 'end_date', 'visits_remaining'):
+            memberships_by_client[membership.client_id].append(membership)
+
+        returned_visits = Counter()
+        for (_, client_id, _), class_date in zip(rows, class_dates):
+            membership = next(
+                (m for m in memberships_by_client[client_id]
+                 if m.start_date <= class_date <= m.end_date),
+                None
+            )
+            if membership and membership.visits_remaining is not None:
+                returned_visits[membership.id] += 1
+
+        # Один UPDATE на каждое встречающееся число возвращаемых посещений
+        membership_ids_by_count = defaultdict(list)
+        for membership_id, count in returned_visits.items():
+            membership_ids_by_count[count].append(membership_id)
+        for count, membership_ids in membership_ids_by_count.items():
+            Membership.objects.filter(id__in=membership_ids).update(
+                visits_remaining=F('visits_remaining') + count
+            )
+
+        # UPDATE минует сигналы моделей - сообщаем подписчикам сами
+        bookings_bulk_updated.send(sender=Booking)
 
     return f"Автоматически отменено {cancelled_count} бронирований"
 
@@ -141,64 +176,83 @@ def cleanup_old_bookings():
     now = timezone.now()
 
     # Находим бронирования прошедших занятий
-    old_bookings = Booking.objects.select_related('class_instance').filter(
+    old_bookings = Booking.objects.filter(
         status=BookingStatus.CONFIRMED,
         class_instance__datetime__lt=now
     )
-
-    completed_count = 0
-    no_show_count = 0
+    has_visit = Exists(Visit.objects.filter(booking=OuterRef('pk')))
 
     with transaction.atomic():
-        for booking in old_bookings:
-            # Если есть отметка посещения - COMPLETED
-            if hasattr(booking, 'visit'):
-                booking.status = BookingStatus.COMPLETED
-                completed_count += 1
-            else:
-                # Если нет отметки - NO_SHOW
-                booking.status = BookingStatus.NO_SHOW
-                no_show_count += 1
-
-            booking.save()
+        # Если есть отметка посещения - COMPLETED
+        completed_count = old_bookings.filter(has_visit).update(status=BookingStatus.COMPLETED)
+        # Если нет отметки - NO_SHOW
+        no_show_count = old_bookings.filter(~has_visit).update(status=BookingStatus.NO_SHOW)
+
+        # UPDATE минует сигналы моделей - сообщаем подписчикам сами
+        if completed_count or no_show_count:
+            bookings_bulk_updated.send(sender=Booking)
 
     return f"Обработано: {completed_count} завершённых, {no_show_count} неявок"
 
 
+def queue_booking_confirmation_emails(booking_ids):
+    """
+    Ставит подтверждения бронирований в очередь пачками
+    по BOOKING_CONFIRMATION_CHUNK_SIZE (одна задача на пачку)
+    """
+    booking_ids = list(booking_ids)
+    for i in range(0, len(booking_ids), BOOKING_CONFIRMATION_CHUNK_SIZE):
+        send_booking_confirmation_emails.delay(
+            booking_ids[i:i + BOOKING_CONFIRMATION_CHUNK_SIZE]
+        )
+
+
 @shared_task
-def send_booking_confirmation_email(booking_id):
+def send_booking_confirmation_emails(booking_ids):
     """
-    Отправляет подтверждение бронирования (вызывается сразу после создания)
+    Отправляет подтверждения бронирований (вызывается сразу после создания).
+    Бронирования загружаются одним запросом на всю пачку
 
     Args:
-        booking_id: ID бронирования
+        booking_ids: список ID бронирований
     """
-    try:
-        booking = Booking.objects.select_related(
-            'client__profile__user',
-            'class_instance__class_type',
-            'class_instance__room',
-            'class_instance__trainer__profile__user'
-        ).get(id=booking_id)
-
-        # Используем Observer pattern
-        booking_subject = BookingSubject()
-
-        user_email = booking.client.profile.user.email
-        phone = booking.client.profile.phone
-        class_name = booking.class_instance.class_type.name
-        class_datetime = booking.class_instance.datetime.strftime('%d.%m.%Y %H:%M')
-
-        booking_subject.booking_created(
-            user_email=user_email,
-            phone=phone,
-            class_name=class_name,
-            class_datetime=class_datetime
-        )
+    bookings = Booking.objects.select_related(
+        'client__profile__user',
+        'class_instance__class_type'
+    ).filter(id__in=booking_ids).only(
+        'class_instance__datetime',
+        'class_instance__class_type__name',
+        'client__profile__phone',
+        'client__profile__user__email'
+    )
+
+    # Используем Observer pattern
+    booking_subject = BookingSubject()
+
+    sent_count = 0
+    for booking in bookings:
+        try:
+            booking_subject.booking_created(
+                user_email=booking.client.profile.user.email,
+                phone=booking.client.profile.phone,
+                class_name=booking.class_instance.class_type.name,
+                class_datetime=booking.class_instance.datetime.strftime('%d.%m.%Y %H:%M')
+            )
+            sent_count += 1
+        except Exception as e:
+            # Логируем ошибку, но продолжаем обработку остальных
+            print(f"Ошибка при отправке подтверждения для бронирования {booking.id}: {e}")
 
-        return f"Отправлено подтверждение для бронирования {booking_id}"
+    return f"Отправлено {sent_count} из {len(booking_ids)} подтверждений"
 
-    except Booking.DoesNotExist:
-        return f"Бронирование {booking_id} не найдено"
-    except Exception as e:
-        return f"Ошибка при отправке подтверждения: {e}"
+
+@shared_task
+def send_booking_confirmation_email(booking_id):
+    """
+    Подтверждение одного бронирования (для задач, поставленных
+    в очередь до перехода на send_booking_confirmation_emails)
+
+    Args:
+        booking_id: ID бронирования
+    """
+    return send_booking_confirmation_emails([booking_id])
@@ -13,7 +13,7 @@ from .models import Booking, Visit, BookingStatus
 from .serializers import BookingSerializer, VisitSerializer, BookingCreateSerializer
 from apps.classes.models import Class
 from apps.accounts.models import Client
-from .tasks import send_booking_confirmation_email
+from .tasks import queue_booking_confirmation_emails
 
 
 class BookingViewSet(viewsets.ModelViewSet):
@@ -41,17 +41,23 @@ class BookingViewSet(viewsets.ModelViewSet):
         Клиенты видят только свои бронирования
         """
         user = self.request.user
+        queryset = self.queryset.with_can_cancel()
 
         # Если пользователь - клиент, показываем только его бронирования
         if hasattr(user, 'profile') and user.profile.role == 'CLIENT':
             try:
                 client = user.profile.client_info
-                return self.queryset.filter(client=client)
+                return queryset.filter(client=client)
             except Client.DoesNotExist:
-                return self.queryset.none()
+                return queryset.none()
 
         # Для админов и тренеров - все бронирования
-        return self.queryset
+        return queryset
+
+    def perform_update(self, serializer):
+        booking = serializer.save()
+        # Аннотация can_cancel вычислена до изменения - пересчитываем в Python
+        booking.__dict__.pop('can_cancel_annot', None)
 
     @action(detail=False, methods=['get'])
     def my(self, request):
@@ -74,7 +80,7 @@ class BookingViewSet(viewsets.ModelViewSet):
             )
 
         # Фильтруем по статусу если указан в query params
-        bookings = self.queryset.filter(client=client)
+        bookings = self.queryset.with_can_cancel().filter(client=client)
         booking_status = request.query_params.get('status')
         if booking_status:
             bookings = bookings.filter(status=booking_status)
@@ -145,7 +151,7 @@ class BookingViewSet(viewsets.ModelViewSet):
             active_membership.save()
 
         # Отправляем email подтверждение асинхронно через Celery
-        send_booking_confirmation_email.delay(booking.id)
+        transaction.on_commit(lambda: queue_booking_confirmation_emails([booking.id]))
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -193,6 +199,7 @@ class BookingViewSet(viewsets.ModelViewSet):
             booking.status = BookingStatus.CANCELLED
             booking.cancelled_at = timezone.now()
             booking.save()
+            booking.__dict__.pop('can_cancel_annot', None)
 
             # Возвращаем посещение в абонемент (если лимитированный)
             active_membership = booking.client.memberships.filter(
@@ -218,9 +225,12 @@ class VisitViewSet(viewsets.ModelViewSet):
 
     Используется администраторами и тренерами для отметки фактического посещения
     """
+    # booking_info (BookingSerializer) читает тип, тренера и зал занятия
     queryset = Visit.objects.select_related(
         'booking__client__profile__user',
-        'booking__class_instance',
+        'booking__class_instance__class_type',
+        'booking__class_instance__trainer__profile__user',
+        'booking__class_instance__room',
         'checked_by'
     ).all()
     serializer_class = VisitSerializer
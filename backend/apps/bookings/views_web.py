@@ -12,7 +12,7 @@ from datetime import timedelta
 from .models import Booking, BookingStatus
 from apps.classes.models import Class
 from apps.accounts.models import Client
-from .tasks import send_booking_confirmation_email
+from .tasks import queue_booking_confirmation_emails
 
 
 @login_required
@@ -40,7 +40,7 @@ def my_bookings_view(request):
         client=client,
         status=BookingStatus.CONFIRMED,
         class_instance__datetime__gte=now
-    ).order_by('class_instance__datetime')
+    ).with_can_cancel(now).order_by('class_instance__datetime')
 
     # Прошедшие бронирования
     past_bookings = Booking.objects.select_related(
@@ -146,7 +146,7 @@ def create_booking_view(request, class_id):
         active_membership.save()
 
     # Отправляем email подтверждение асинхронно
-    send_booking_confirmation_email.delay(booking.id)
+    transaction.on_commit(lambda: queue_booking_confirmation_emails([booking.id]))
 
     messages.success(
         request,
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("classes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="class",
+            index=models.Index(
+                fields=["trainer", "datetime"], name="class_trainer_datetime_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="class",
+            index=models.Index(fields=["datetime"], name="class_datetime_idx"),
+        ),
+    ]
@@ -59,6 +59,11 @@ class Class(models.Model):
         verbose_name = 'Занятие'
         verbose_name_plural = 'Занятия'
         ordering = ['datetime']
+        indexes = [
+            # Расписание тренера за период (trainer_dashboard)
+            models.Index(fields=['trainer', 'datetime'], name='class_trainer_datetime_idx'),
+            models.Index(fields=['datetime'], name='class_datetime_idx'),
+        ]
 
     def __str__(self):
         return f"{self.class_type.name} - {self.datetime.strftime('%d.%m.%Y %H:%M')}"
@@ -37,7 +37,8 @@ def send_membership_expiry_reminders():
 
     sent_count = 0
 
-    for membership in expiring_memberships:
+    # Строки читаются серверным курсором пачками, без кеша всего queryset
+    for membership in expiring_memberships.iterator(chunk_size=500):
         try:
             user = membership.client.profile.user
             user_email = user.email
@@ -5,6 +5,7 @@ Celery configuration for АС УСК project.
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.dev')
@@ -44,8 +45,29 @@ app.conf.beat_schedule = {
         'task': 'apps.memberships.tasks.deactivate_expired_memberships',
         'schedule': crontab(hour=1, minute=0),  # 1 AM every day
     },
+    # Drain queued welcome emails into batched sends
+    'dispatch-welcome-emails': {
+        'task': 'apps.accounts.tasks.dispatch_welcome_emails',
+        'schedule': 5.0,  # Every 5 seconds
+    },
 }
 
+
+@worker_init.connect
+def patch_psycopg_for_gevent(**kwargs):
+    """
+    psycopg2 is a C extension: under the gevent pool (emails queue)
+    DB calls must be made cooperative, otherwise they block the hub.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return
+    if monkey.is_module_patched('socket'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
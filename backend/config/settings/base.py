@@ -85,6 +85,11 @@ DATABASES = {
     }
 }
 
+# Authentication: ModelBackend с пользователем и профилем из Redis
+AUTHENTICATION_BACKENDS = [
+    'apps.accounts.backends.CachedModelBackend',
+]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -136,6 +141,10 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
@@ -182,6 +191,14 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# I/O-bound email tasks go to a separate queue served by a gevent worker:
+# celery -A config worker -Q emails -P gevent -c 100 --without-gossip --without-mingle --without-heartbeat
+CELERY_TASK_ROUTES = {
+    'apps.accounts.tasks.send_welcome_email': {'queue': 'emails'},
+    'apps.accounts.tasks.dispatch_welcome_emails': {'queue': 'emails'},
+    'apps.accounts.tasks.send_welcome_emails_batch': {'queue': 'emails'},
+}
+
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -5,6 +5,8 @@ Pytest configuration and fixtures
 
 import pytest
 from django.contrib.auth.models import User
+from django.test import Client as DjangoTestClient
+from django.test.utils import override_settings
 from rest_framework.test import APIClient
 from decimal import Decimal
 
@@ -16,6 +18,20 @@ from apps.bookings.models import Booking, BookingStatus
 from apps.payments.models import Payment, PaymentStatus, PaymentMethod
 
 
+# ============================================================================
+# Test Settings
+# ============================================================================
+
+@pytest.fixture(scope='session', autouse=True)
+def fast_password_hasher():
+    """
+    MD5 вместо PBKDF2 во всех тестах: create_user/set_password
+    становятся почти бесплатными (только для тестов!)
+    """
+    with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+        yield
+
+
 # ============================================================================
 # Database and Client Fixtures
 # ============================================================================
@@ -26,6 +42,12 @@ def api_client():
     return APIClient()
 
 
+@pytest.fixture(scope='function')
+def plain_client():
+    """Django test Client для проверок только статуса ответа (без APIClient)"""
+    return DjangoTestClient()
+
+
 @pytest.fixture(scope='function')
 def authenticated_client(api_client, test_client_user):
     """APIClient с авторизованным клиентом"""
@@ -67,7 +89,9 @@ def test_client_user(test_user):
             'phone': '+79991234567'
         }
     )
-    client, _ = Client.objects.get_or_create(
+    # Client уже создан сигналом профиля: update_or_create применяет значения
+    # фикстуры, а присваивание заменяет закешированный сигналом profile.client_info
+    profile.client_info, _ = Client.objects.update_or_create(
         profile=profile,
         defaults={'is_student': False}
     )
@@ -96,14 +120,10 @@ def test_student_user():
             'phone': '+79991234568'
         }
     )
-    client, created = Client.objects.get_or_create(
+    profile.client_info, _ = Client.objects.update_or_create(
         profile=profile,
         defaults={'is_student': True}
     )
-    # Всегда устанавливаем is_student=True для этой фикстуры
-    if not client.is_student:
-        client.is_student = True
-        client.save()
     return user
 
 
@@ -129,7 +149,8 @@ def test_trainer_user():
             'phone': '+79991234569'
         }
     )
-    trainer, _ = Trainer.objects.get_or_create(
+    # Trainer уже создан сигналом профиля со значениями по умолчанию
+    profile.trainer_info, _ = Trainer.objects.update_or_create(
         profile=profile,
         defaults={
             'specialization': 'Йога',
@@ -332,7 +353,8 @@ def create_client():
         )
         client_defaults = {'is_student': False}
         client_defaults.update(kwargs)
-        return Client.objects.create(profile=profile, **client_defaults)
+        client, _ = Client.objects.update_or_create(profile=profile, defaults=client_defaults)
+        return client
     return _create_client
 
 
@@ -0,0 +1,31 @@
+"""
+JSON рендерер DRF на orjson
+
+orjson сериализует dict/list/str/datetime/UUID в C, без обхода данных
+через json.JSONEncoder. Остальные типы (Decimal, lazy-строки, QuerySet)
+преобразуются так же, как в стандартном JSONRenderer DRF.
+"""
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Запасной обработчик для типов, которые orjson не знает
+_default = JSONEncoder().default
+
+# UTC пишется как 'Z', как в JSONEncoder DRF
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Замена rest_framework.renderers.JSONRenderer
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)